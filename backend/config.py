@@ -44,6 +44,13 @@ class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+
+    # Per-worker HTTP connection pool toward Supabase/PostgREST. Each uvicorn
+    # worker holds its own pool, so size these against the PostgREST/pgbouncer
+    # connection budget divided by the worker count.
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "20"))
+    DB_KEEPALIVE_CONNECTIONS: int = int(os.getenv("DB_KEEPALIVE_CONNECTIONS", "10"))
+    DB_KEEPALIVE_EXPIRY: float = float(os.getenv("DB_KEEPALIVE_EXPIRY", "300"))
     
     # Solana configuration
     SOLANA_RPC_URL: str = os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com")
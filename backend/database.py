@@ -4,8 +4,10 @@ Database connection and query utilities.
 Uses Supabase Python client for PostgreSQL database access.
 """
 
-from supabase import create_client, Client
-from typing import Optional, Dict, Any, List
+import asyncio
+import httpx
+from supabase import create_async_client, AsyncClient, AsyncClientOptions
+from typing import Optional, Dict, Any, List, Sequence, Union
 import logging
 from config import settings
 
@@ -17,23 +19,53 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# Global Supabase client
-_supabase: Optional[Client] = None
+# Global Supabase client; the lock keeps concurrent first callers from
+# building it twice
+_supabase: Optional[AsyncClient] = None
+_supabase_lock = asyncio.Lock()
 
 
-def get_supabase_client() -> Client:
-    """Get or create Supabase client instance"""
+async def get_supabase_client() -> AsyncClient:
+    """Get or create the shared async Supabase client instance"""
     global _supabase
-    
+
     if _supabase is None:
-        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
-            )
-        
-        _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-        logger.info("Supabase client initialized")
-    
+        async with _supabase_lock:
+            if _supabase is None:
+                if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
+                    )
+
+                # The async client keeps queries off the event loop thread, so
+                # independent round-trips gathered by the handlers genuinely
+                # overlap. Every query hits the same Supabase host; HTTP/2
+                # with a keep-alive pool multiplexes them over one TLS
+                # connection instead of paying handshake + TCP setup per
+                # call. The pool is bounded per worker (see DB_* settings) so
+                # N workers can't exhaust the PostgREST/pgbouncer connection
+                # budget under load.
+                _supabase = await create_async_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY,
+                    options=AsyncClientOptions(
+                        httpx_client=httpx.AsyncClient(
+                            http2=True,
+                            limits=httpx.Limits(
+                                max_connections=settings.DB_MAX_CONNECTIONS,
+                                max_keepalive_connections=settings.DB_KEEPALIVE_CONNECTIONS,
+                                keepalive_expiry=settings.DB_KEEPALIVE_EXPIRY,
+                            ),
+                            timeout=httpx.Timeout(120),
+                        ),
+                    ),
+                )
+                logger.info(
+                    "Supabase async client initialized (HTTP/2, pool: %d max / %d keep-alive)",
+                    settings.DB_MAX_CONNECTIONS,
+                    settings.DB_KEEPALIVE_CONNECTIONS,
+                )
+
     return _supabase
 
 
@@ -41,43 +73,134 @@ async def execute_query(
     table: str,
     operation: str = "select",
     filters: Optional[Dict[str, Any]] = None,
-    data: Optional[Dict[str, Any]] = None,
+    data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
     limit: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+    offset: Optional[int] = None,
+    in_filters: Optional[Dict[str, Sequence[Any]]] = None,
+    not_in_filters: Optional[Dict[str, Sequence[Any]]] = None,
+    or_filters: Optional[str] = None,
+    on_conflict: Optional[Union[str, Sequence[str]]] = None,
+    ignore_duplicates: bool = False,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+    columns: str = "*",
+    match_all_column: Optional[str] = None,
+) -> Union[List[Dict[str, Any]], bool, int]:
     """
     Execute a database query using Supabase client.
-    
+
     Args:
         table: Table name
-        operation: Operation type (select, insert, update, delete)
+        operation: Operation type (select, exists, count, insert, upsert,
+            update, delete, delete_all)
         filters: Optional filters for select operations
-        data: Data for insert/update operations
+        data: Data for insert/upsert/update operations; insert and upsert also
+            accept a list of rows, written in a single statement
         limit: Optional limit for select operations
-    
+        offset: Optional offset for select operations (requires limit; maps to
+            a PostgREST range so pagination happens in the database)
+        in_filters: Optional column -> allowed-values filters (SQL IN) for
+            select and delete operations
+        not_in_filters: Optional column -> excluded-values filters
+            (SQL NOT IN) for select operations
+        or_filters: Optional PostgREST disjunction string for select
+            operations, e.g. "is_public.eq.true,pool_id.in.(1,2)"; ANDed
+            with the other filters
+        on_conflict: Conflict target columns for upsert (comma-separated string
+            or a sequence of column names)
+        ignore_duplicates: For upsert, issue ON CONFLICT DO NOTHING instead of
+            DO UPDATE (existing rows are left untouched)
+        order_by: Optional column to ORDER BY for select operations
+        descending: Sort direction for order_by (default ascending)
+        columns: Projection for select operations (comma-separated, default
+            all columns); narrower projections cut transfer and parse cost
+        match_all_column: Key column for the delete_all operation, used to
+            build the match-every-row predicate PostgREST requires
+
     Returns:
-        List of result rows
+        List of result rows, a bool for the "exists" operation, or an int
+        for the "count" operation
     """
-    client = get_supabase_client()
+    client = await get_supabase_client()
     
     try:
         if operation == "select":
-            query = client.table(table).select("*")
+            query = client.table(table).select(columns)
             
             if filters:
                 for key, value in filters.items():
                     query = query.eq(key, value)
-            
-            if limit:
+
+            if in_filters:
+                for key, values in in_filters.items():
+                    query = query.in_(key, list(values))
+
+            if not_in_filters:
+                for key, values in not_in_filters.items():
+                    query = query.not_.in_(key, list(values))
+
+            if or_filters:
+                query = query.or_(or_filters)
+
+            if order_by:
+                query = query.order(order_by, desc=descending)
+
+            if offset is not None:
+                if not limit:
+                    raise ValueError("Limit required when offset is provided")
+                query = query.range(offset, offset + limit - 1)
+            elif limit:
                 query = query.limit(limit)
-            
-            response = query.execute()
+
+            response = await query.execute()
             return response.data if response.data else []
         
+        elif operation == "exists":
+            if not filters:
+                raise ValueError("Filters required for exists operation")
+
+            # HEAD request with an exact count: no rows are serialized or
+            # decoded, only the count header comes back
+            query = client.table(table).select("*", count="exact", head=True)
+            for key, value in filters.items():
+                query = query.eq(key, value)
+
+            response = await query.execute()
+            return bool(response.count)
+
+        elif operation == "count":
+            # Same HEAD/count mechanism as "exists", but returns the number
+            # of matching rows (filters optional: no filters = table count)
+            query = client.table(table).select("*", count="exact", head=True)
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+            if in_filters:
+                for key, values in in_filters.items():
+                    query = query.in_(key, list(values))
+
+            response = await query.execute()
+            return response.count or 0
+
         elif operation == "insert":
             if not data:
                 raise ValueError("Data required for insert operation")
-            
-            response = client.table(table).insert(data).execute()
+
+            response = await client.table(table).insert(data).execute()
+            return response.data if response.data else []
+
+        elif operation == "upsert":
+            if not data:
+                raise ValueError("Data required for upsert operation")
+
+            if on_conflict is not None and not isinstance(on_conflict, str):
+                on_conflict = ",".join(on_conflict)
+
+            # Maps to Postgres INSERT ... ON CONFLICT ... DO UPDATE (or
+            # DO NOTHING with ignore_duplicates) RETURNING *
+            response = await client.table(table).upsert(
+                data, on_conflict=on_conflict, ignore_duplicates=ignore_duplicates
+            ).execute()
             return response.data if response.data else []
         
         elif operation == "update":
@@ -90,62 +213,141 @@ async def execute_query(
             for key, value in filters.items():
                 query = query.eq(key, value)
             
-            response = query.execute()
+            response = await query.execute()
             return response.data if response.data else []
         
         elif operation == "delete":
-            if not filters:
+            if not filters and not in_filters:
                 raise ValueError("Filters required for delete operation")
-            
+
             query = client.table(table).delete()
-            for key, value in filters.items():
-                query = query.eq(key, value)
-            
-            response = query.execute()
+            if filters:
+                for key, value in filters.items():
+                    query = query.eq(key, value)
+            if in_filters:
+                for key, values in in_filters.items():
+                    query = query.in_(key, list(values))
+
+            response = await query.execute()
             return response.data if response.data else []
-        
+
+        elif operation == "delete_all":
+            if not match_all_column:
+                raise ValueError("match_all_column required for delete_all operation")
+
+            # "delete" insists on real filters so a bug can never silently
+            # wipe a table; whole-table deletes go through this explicit
+            # operation instead, matching every row via a tautology on the
+            # key column (PostgREST refuses unfiltered DELETEs)
+            response = await client.table(table).delete().neq(match_all_column, -1).execute()
+            return response.data if response.data else []
+
         else:
             raise ValueError(f"Unknown operation: {operation}")
     
     except Exception as e:
-        logger.error(f"Database query error: {e}", exc_info=True)
-        
-        # Extract detailed error message from Supabase/PostgREST exceptions
-        error_msg = str(e)
-        
-        # Handle PostgREST APIError specifically
-        if PostgrestAPIError and isinstance(e, PostgrestAPIError):
-            if hasattr(e, 'message'):
-                error_msg = e.message
-            elif hasattr(e, 'details'):
-                error_msg = e.details
-            elif hasattr(e, 'hint'):
-                error_msg = f"{error_msg}. Hint: {e.hint}"
-        
-        # Check if it's a Supabase/PostgREST API error
+        _raise_db_error(e)
+
+
+async def execute_rpc(fn: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Call a Postgres function exposed through PostgREST RPC.
+
+    Args:
+        fn: Function name (must be defined in the database; see backend/sql/)
+        params: Function arguments keyed by parameter name
+
+    Returns:
+        List of result rows (scalar results are wrapped in a single-item list)
+    """
+    client = await get_supabase_client()
+
+    try:
+        response = await client.rpc(fn, params).execute()
+        data = response.data
+        if isinstance(data, list):
+            return data
+        return [data] if data is not None else []
+    except Exception as e:
+        _raise_db_error(e)
+
+
+def compile_select(
+    table: str,
+    filter_keys: Sequence[str],
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+):
+    """
+    Pre-bind a fixed-shape select query for a hot call site.
+
+    Returns an async closure taking the filter values positionally (in
+    filter_keys order). The table name, filter keys and query options are
+    captured once instead of being re-assembled from kwargs and dicts on
+    every call.
+    """
+    keys = tuple(filter_keys)
+
+    async def run(*values: Any) -> List[Dict[str, Any]]:
+        client = await get_supabase_client()
+        try:
+            query = client.table(table).select("*")
+            for key, value in zip(keys, values):
+                query = query.eq(key, value)
+            if order_by:
+                query = query.order(order_by, desc=descending)
+            if limit:
+                query = query.limit(limit)
+            response = await query.execute()
+            return response.data if response.data else []
+        except Exception as e:
+            _raise_db_error(e)
+
+    run.__name__ = f"select_{table}_by_{'_'.join(keys)}"
+    return run
+
+
+def _raise_db_error(e: Exception) -> None:
+    """Translate a Supabase/PostgREST exception into an informative error."""
+    logger.error(f"Database query error: {e}", exc_info=True)
+
+    # Extract detailed error message from Supabase/PostgREST exceptions
+    error_msg = str(e)
+    
+    # Handle PostgREST APIError specifically
+    if PostgrestAPIError and isinstance(e, PostgrestAPIError):
         if hasattr(e, 'message'):
             error_msg = e.message
-        elif hasattr(e, 'args') and len(e.args) > 0:
-            # PostgREST errors often have the message in args[0]
-            if isinstance(e.args[0], dict):
-                error_msg = e.args[0].get('message', str(e.args[0]))
-            else:
-                error_msg = str(e.args[0])
-        
-        # Check for common database errors and provide helpful messages
-        error_str = error_msg.lower()
-        if 'column' in error_str and ('does not exist' in error_str or 'unknown column' in error_str):
-            error_msg = f"Database schema mismatch: {error_msg}. Please ensure all migrations have been run. Missing columns may need to be added via migration."
-        elif 'duplicate key' in error_str or 'unique constraint' in error_str:
-            error_msg = f"Duplicate entry: {error_msg}"
-        elif 'null value' in error_str or 'not null constraint' in error_str:
-            error_msg = f"Missing required field: {error_msg}"
-        elif 'foreign key' in error_str:
-            error_msg = f"Referenced record does not exist: {error_msg}"
-        
-        # Create a more informative exception
-        db_error = Exception(f"Database error: {error_msg}")
-        db_error.original_error = e
-        raise db_error
+        elif hasattr(e, 'details'):
+            error_msg = e.details
+        elif hasattr(e, 'hint'):
+            error_msg = f"{error_msg}. Hint: {e.hint}"
+    
+    # Check if it's a Supabase/PostgREST API error
+    if hasattr(e, 'message'):
+        error_msg = e.message
+    elif hasattr(e, 'args') and len(e.args) > 0:
+        # PostgREST errors often have the message in args[0]
+        if isinstance(e.args[0], dict):
+            error_msg = e.args[0].get('message', str(e.args[0]))
+        else:
+            error_msg = str(e.args[0])
+    
+    # Check for common database errors and provide helpful messages
+    error_str = error_msg.lower()
+    if 'column' in error_str and ('does not exist' in error_str or 'unknown column' in error_str):
+        error_msg = f"Database schema mismatch: {error_msg}. Please ensure all migrations have been run. Missing columns may need to be added via migration."
+    elif 'duplicate key' in error_str or 'unique constraint' in error_str:
+        error_msg = f"Duplicate entry: {error_msg}"
+    elif 'null value' in error_str or 'not null constraint' in error_str:
+        error_msg = f"Missing required field: {error_msg}"
+    elif 'foreign key' in error_str:
+        error_msg = f"Referenced record does not exist: {error_msg}"
+    
+    # Create a more informative exception
+    db_error = Exception(f"Database error: {error_msg}")
+    db_error.original_error = e
+    raise db_error
 
 
@@ -6,12 +6,17 @@ FastAPI application for managing commitment pools, check-ins, and user data.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
+import os
+
+import orjson
 
 from routers import pools, checkins, users, invites, ai_onchain, solana_actions, waitlist
 from config import settings
+from database import get_supabase_client
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +30,20 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("Starting Commitment Agent Backend API")
+    # Warm the shared Supabase client so the first request doesn't pay
+    # client construction + TLS setup; every execute_query call reuses it
+    try:
+        await get_supabase_client()
+    except ValueError as e:
+        logger.warning(f"Supabase client not initialized at startup: {e}")
+    # Warm the shared Solana AsyncClient too, so the first join/verification
+    # request doesn't pay RPC TCP/TLS setup (or race the lazy initializer)
+    try:
+        await pools.get_solana_client()
+    except Exception as e:
+        logger.warning(f"Solana client not initialized at startup: {e}")
     yield
+    await ai_onchain.close_llm_client()
     logger.info("Shutting down Commitment Agent Backend API")
 
 
@@ -35,6 +53,7 @@ app = FastAPI(
     description="Backend API for Commitment Agent - AI-powered accountability pools",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -46,8 +65,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
+# Compress larger JSON responses (check-in history, pool lists) on the wire.
+# add_middleware prepends, so GZip (added last) is the outermost layer and
+# compresses everything below it, CORS headers included.
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Include routers
 app.include_router(pools.router, prefix="/api/pools", tags=["pools"])
 app.include_router(checkins.router, prefix="/api/checkins", tags=["checkins"])
@@ -62,98 +87,114 @@ app.include_router(
 app.include_router(waitlist.router, prefix="/api/waitlist", tags=["waitlist"])
 
 
+# Static payloads, serialized once at import time. These endpoints are hit on
+# every health probe / Blink unfurl and their content never changes for the
+# lifetime of the process.
+_HEALTH_BYTES = orjson.dumps({
+    "status": "ok",
+    "service": "commitment-agent-backend",
+    "version": "1.0.0",
+})
+
+_ROOT_BYTES = orjson.dumps({
+    "message": "Commitment Agent API",
+    "docs": "/docs",
+    "health": "/health",
+})
+
+# CORS headers required by the Solana Actions spec
+_ACTIONS_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, Content-Encoding, Accept-Encoding",
+    "Access-Control-Max-Age": "86400",
+}
+
+
+def _build_actions_json_bytes() -> bytes:
+    """Build the Solana Actions config (actions.json) once at import time."""
+    base_url = os.getenv("BACKEND_URL", "https://commitment-backend.onrender.com").rstrip('/')
+    # Reference: https://docs.solana.com/developers/actions-and-blinks
+    return orjson.dumps({
+        "version": "1.0.0",
+        "rules": [
+            {
+                "pathPattern": "/solana/actions/join-pool",
+                "apiPath": f"{base_url}/solana/actions/join-pool"
+            },
+            {
+                "pathPattern": "/solana/actions/create-pool",
+                "apiPath": f"{base_url}/solana/actions/create-pool"
+            },
+            {
+                "pathPattern": "/solana/actions/*",
+                "apiPath": f"{base_url}/solana/actions/*"
+            }
+        ]
+    })
+
+
+_ACTIONS_JSON_BYTES = _build_actions_json_bytes()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {
-        "status": "ok",
-        "service": "commitment-agent-backend",
-        "version": "1.0.0",
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": "Commitment Agent API",
-        "docs": "/docs",
-        "health": "/health",
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.options("/actions.json")
 async def options_actions_json():
     """Handle CORS preflight requests for actions.json"""
-    from fastapi.responses import Response
-    return Response(
-        status_code=200,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization, Content-Encoding, Accept-Encoding",
-        }
-    )
+    return Response(status_code=200, headers=_ACTIONS_CORS_HEADERS)
 
 
 @app.get("/actions.json")
 async def actions_json():
     """
     Solana Actions configuration file.
-    
+
     Maps URL patterns to API endpoints for Blink integration.
     Required for Twitter/X Blinks to properly unfurl and recognize actions.
-    
+
     This file must be accessible at the root domain for Blinks to work.
     Must return CORS headers with Access-Control-Allow-Origin: *
     """
-    import os
-    
-    # Get base URL from environment or use default
-    base_url = os.getenv("BACKEND_URL", "https://commitment-backend.onrender.com")
-    base_url = base_url.rstrip('/')
-    
-    # Return actions.json in the format expected by Solana Actions
-    # Reference: https://docs.solana.com/developers/actions-and-blinks
-    actions_config = {
-        "version": "1.0.0",
-        "rules": [
-            {
-                "pathPattern": "/solana/actions/join-pool",
-                "apiPath": f"{base_url}/solana/actions/join-pool"
-            },
-            {
-                "pathPattern": "/solana/actions/create-pool",
-                "apiPath": f"{base_url}/solana/actions/create-pool"
-            },
-            {
-                "pathPattern": "/solana/actions/*",
-                "apiPath": f"{base_url}/solana/actions/*"
-            }
-        ]
-    }
-    
-    # Return with CORS headers as required by spec
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
-        content=actions_config,
-        headers={
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",  # Required by spec
-            "Access-Control-Allow-Methods": "GET, POST, PUT, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization, Content-Encoding, Accept-Encoding",
-        }
+    return Response(
+        content=_ACTIONS_JSON_BYTES,
+        media_type="application/json",
+        headers=_ACTIONS_CORS_HEADERS,
     )
 
 
+# Pre-built error body for the non-debug path; avoids stringifying the
+# exception and re-encoding the same payload on every failure
+_ERROR_BYTES = orjson.dumps({"error": "Internal server error"})
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
+    # Client aborts aren't server errors; skip the expensive traceback
+    # format. (CancelledError can't be caught here - it subclasses
+    # BaseException and Starlette lets it propagate past Exception handlers.)
+    if isinstance(exc, ConnectionResetError):
+        logger.warning("Request aborted by client: %r", exc)
+        return Response(status_code=500)
+
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={"error": "Internal server error", "detail": str(exc)},
-    )
+    if settings.DEBUG:
+        return ORJSONResponse(
+            status_code=500,
+            content={"error": "Internal server error", "detail": str(exc)},
+        )
+    return Response(content=_ERROR_BYTES, status_code=500, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -163,5 +204,13 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        # One worker with reload in dev; 2*CPU+1 in prod so a slow LLM call
+        # can't stall every request on a single event loop
+        workers=1 if settings.DEBUG else (os.cpu_count() or 1) * 2 + 1,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        backlog=2048,
     )
 
@@ -4,11 +4,46 @@ Pydantic models for request/response validation.
 Provides type-safe data models for API endpoints.
 """
 
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 
 
+# Goal metadata models
+#
+# Known goal_metadata shapes get typed models so pydantic-core validates them
+# on its fast path instead of walking a generic Dict[str, Any]. Every model
+# allows extra keys, and the union below falls back to a plain dict, so
+# experimental goal types and future habit_type values keep working unchanged.
+class HodlTokenMeta(BaseModel):
+    """Metadata for hodl_token goals (on-chain balance checks)"""
+    model_config = ConfigDict(extra="allow")
+
+    token_mint: str = Field(..., description="SPL token mint address", min_length=32, max_length=44)
+    min_balance: int = Field(..., ge=0, description="Minimum raw token balance to hold")
+    check_frequency: Optional[str] = Field(None, description="How often balances are checked (e.g. 'hourly')")
+
+
+class DailyDCAMeta(BaseModel):
+    """Metadata for DailyDCA goals (per-day trade activity)"""
+    model_config = ConfigDict(extra="allow")
+
+    token_mint: str = Field(..., description="SPL token mint address", min_length=32, max_length=44)
+    min_trades_per_day: int = Field(1, ge=1, description="Minimum trades per day")
+
+
+class LifestyleHabitMeta(BaseModel):
+    """Metadata for lifestyle_habit goals (github_commits, screen_time, ...)"""
+    model_config = ConfigDict(extra="allow")
+
+    habit_type: str = Field(..., description="Lifestyle habit identifier", max_length=50)
+
+
+# Smart union: typed models handle the known shapes; the dict fallback keeps
+# goal_metadata extensible for new goal families without a models.py change.
+GoalMetadata = Union[HodlTokenMeta, DailyDCAMeta, LifestyleHabitMeta, Dict[str, Any]]
+
+
 # Pool Models
 class GoalTypeBase(BaseModel):
     """
@@ -66,7 +101,7 @@ class GoalTypeBase(BaseModel):
             "(e.g. 'hodl_token', 'lifestyle_habit', or experimental types like 'DailyDCA')"
         ),
     )
-    goal_metadata: Dict[str, Any] = Field(
+    goal_metadata: GoalMetadata = Field(
         ...,
         description="Goal-specific metadata; shape depends on goal_type (see class docstring)",
     )
@@ -75,12 +110,12 @@ class GoalTypeBase(BaseModel):
 class PoolCreate(BaseModel):
     """Request model for creating a pool"""
     pool_id: int = Field(..., description="Unique pool ID")
-    pool_pubkey: str = Field(..., description="On-chain pool public key", max_length=44)
-    creator_wallet: str = Field(..., description="Wallet address of pool creator", max_length=44)
+    pool_pubkey: str = Field(..., description="On-chain pool public key", min_length=32, max_length=44)
+    creator_wallet: str = Field(..., description="Wallet address of pool creator", min_length=32, max_length=44)
     name: str = Field(..., description="Pool name", max_length=100)
     description: Optional[str] = Field(None, description="Pool description")
     goal_type: str = Field(..., description="Type of goal")
-    goal_metadata: Dict[str, Any] = Field(..., description="Goal-specific metadata")
+    goal_metadata: GoalMetadata = Field(..., description="Goal-specific metadata")
     stake_amount: float = Field(..., gt=0, description="Stake amount in SOL")
     duration_days: int = Field(..., ge=1, le=30, description="Duration in days")
     max_participants: int = Field(..., ge=1, le=100, description="Maximum participants")
@@ -95,7 +130,7 @@ class PoolCreate(BaseModel):
         le=100,
         description="Percentage of losers stakes to winners; remainder to charity",
     )
-    charity_address: str = Field(..., description="Charity wallet address", max_length=44)
+    charity_address: str = Field(..., description="Charity wallet address", min_length=32, max_length=44)
     start_timestamp: int = Field(..., description="Pool start timestamp")
     end_timestamp: int = Field(..., description="Pool end timestamp")
     is_public: bool = Field(True, description="Whether pool is public")
@@ -114,13 +149,13 @@ class PoolCreate(BaseModel):
 class PoolConfirmRequest(BaseModel):
     """Request model for confirming pool creation after on-chain transaction"""
     pool_id: int = Field(..., description="Unique pool ID")
-    pool_pubkey: str = Field(..., description="On-chain pool public key", max_length=44)
+    pool_pubkey: str = Field(..., description="On-chain pool public key", min_length=32, max_length=44)
     transaction_signature: str = Field(..., description="Transaction signature from Solana")
-    creator_wallet: str = Field(..., description="Wallet address of pool creator", max_length=44)
+    creator_wallet: str = Field(..., description="Wallet address of pool creator", min_length=32, max_length=44)
     name: str = Field(..., description="Pool name", max_length=100)
     description: Optional[str] = Field(None, description="Pool description")
     goal_type: str = Field(..., description="Type of goal")
-    goal_metadata: Dict[str, Any] = Field(..., description="Goal-specific metadata")
+    goal_metadata: GoalMetadata = Field(..., description="Goal-specific metadata")
     stake_amount: float = Field(..., gt=0, description="Stake amount in SOL")
     duration_days: int = Field(..., ge=1, le=30, description="Duration in days")
     max_participants: int = Field(..., ge=1, le=100, description="Maximum participants")
@@ -144,7 +179,7 @@ class PoolConfirmRequest(BaseModel):
         le=100,
         description="Percentage of losers stakes to winners; remainder to charity",
     )
-    charity_address: str = Field(..., description="Charity wallet address", max_length=44)
+    charity_address: str = Field(..., description="Charity wallet address", min_length=32, max_length=44)
     start_timestamp: int = Field(..., description="Pool start timestamp")
     end_timestamp: int = Field(..., description="Pool end timestamp")
     is_public: bool = Field(True, description="Whether pool is public")
@@ -163,13 +198,13 @@ class PoolConfirmRequest(BaseModel):
 class JoinPoolConfirmRequest(BaseModel):
     """Request model for confirming pool join after on-chain transaction"""
     transaction_signature: str = Field(..., description="Transaction signature from Solana")
-    participant_wallet: str = Field(..., description="Participant wallet address", max_length=44)
+    participant_wallet: str = Field(..., description="Participant wallet address", min_length=32, max_length=44)
 
 
 class ForfeitPoolConfirmRequest(BaseModel):
     """Request model for confirming pool forfeit after on-chain transaction"""
     transaction_signature: str = Field(..., description="Transaction signature from Solana")
-    participant_wallet: str = Field(..., description="Participant wallet address", max_length=44)
+    participant_wallet: str = Field(..., description="Participant wallet address", min_length=32, max_length=44)
 
 
 class PoolResponse(BaseModel):
@@ -214,12 +249,17 @@ class PoolResponse(BaseModel):
 class CheckInCreate(BaseModel):
     """Request model for creating a check-in"""
     pool_id: int = Field(..., description="Pool ID")
-    participant_wallet: str = Field(..., description="Participant wallet address", max_length=44)
+    participant_wallet: str = Field(..., description="Participant wallet address", min_length=32, max_length=44)
     day: int = Field(..., ge=1, description="Day number")
     success: bool = Field(..., description="Whether check-in was successful")
     screenshot_url: Optional[str] = Field(None, description="Optional screenshot URL", max_length=500)
 
 
+class CheckInBulkCreate(BaseModel):
+    """Request model for submitting multiple check-ins at once"""
+    items: List[CheckInCreate] = Field(..., min_length=1, max_length=50, description="Check-ins to submit")
+
+
 class CheckInResponse(BaseModel):
     """Response model for check-in data"""
     id: int
@@ -256,7 +296,7 @@ class UserResponse(BaseModel):
 # GitHub Verification Models
 class GitHubVerifyRequest(BaseModel):
     """Request model for GitHub verification"""
-    wallet_address: str = Field(..., description="Wallet address to verify", max_length=44)
+    wallet_address: str = Field(..., description="Wallet address to verify", min_length=32, max_length=44)
     github_username: str = Field(..., description="GitHub username to verify", max_length=100)
     gist_id: str = Field(..., description="GitHub Gist ID containing verification signature", max_length=100)
     signature: str = Field(..., description="Signed message from wallet", max_length=200)
@@ -7,9 +7,10 @@ Takes natural language descriptions and generates Solana program instructions.
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
+import functools
 import logging
 import httpx
-import json
+import orjson
 
 from config import settings
 
@@ -18,6 +19,42 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+# LLM settings are immutable for the process lifetime; bind them once at
+# import instead of doing getattr lookups and rebuilding headers per call
+_LLM_API_URL = settings.LLM_API_URL
+_LLM_API_KEY = settings.LLM_API_KEY
+_LLM_MODEL = settings.LLM_MODEL or "gpt-4o-mini"
+_LLM_HEADERS = {
+    "Authorization": f"Bearer {_LLM_API_KEY}",
+    "Content-Type": "application/json",
+}
+
+# Shared HTTP client for LLM calls, reused across requests so each call skips
+# the TCP+TLS handshake to the LLM vendor. Closed from the app lifespan.
+_llm_client: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_client() -> httpx.AsyncClient:
+    """Get or create the shared AsyncClient used for LLM API calls."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = httpx.AsyncClient(
+            timeout=30,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        logger.info("Initialized shared LLM HTTP client")
+    return _llm_client
+
+
+async def close_llm_client() -> None:
+    """Close the shared LLM client (called on app shutdown)."""
+    global _llm_client
+    if _llm_client is not None:
+        await _llm_client.aclose()
+        _llm_client = None
+
+
 class OnChainActionRequest(BaseModel):
     """Request model for AI on-chain action generation"""
     description: str = Field(..., min_length=1, max_length=2000, description="Natural language description of the on-chain action")
@@ -97,22 +134,14 @@ class ChallengeBlueprint(BaseModel):
 
 async def _call_llm(prompt: str) -> str:
     """Call LLM API to generate instruction data"""
-    api_url = getattr(settings, "LLM_API_URL", None)
-    api_key = getattr(settings, "LLM_API_KEY", None)
-
-    if not api_url or not api_key:
+    if not _LLM_API_URL or not _LLM_API_KEY:
         raise HTTPException(
             status_code=500,
             detail="LLM_API_URL and LLM_API_KEY must be configured for AI on-chain actions"
         )
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
     payload = {
-        "model": getattr(settings, "LLM_MODEL", "gpt-4o-mini"),
+        "model": _LLM_MODEL,
         "messages": [
             {
                 "role": "system",
@@ -127,8 +156,8 @@ async def _call_llm(prompt: str) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(api_url, json=payload, headers=headers)
+        client = get_llm_client()
+        resp = await client.post(_LLM_API_URL, json=payload, headers=_LLM_HEADERS)
 
         if resp.status_code != 200:
             raise HTTPException(
@@ -136,7 +165,8 @@ async def _call_llm(prompt: str) -> str:
                 detail=f"LLM API error: status={resp.status_code}, body={resp.text}"
             )
 
-        data = resp.json()
+        # Parse the raw bytes once with orjson instead of httpx's stdlib-json path
+        data = orjson.loads(resp.content)
         content = data["choices"][0]["message"]["content"]
         return content.strip()
     except httpx.TimeoutException:
@@ -146,9 +176,9 @@ async def _call_llm(prompt: str) -> str:
         raise HTTPException(status_code=500, detail=f"Failed to call LLM: {str(e)}")
 
 
-def _build_prompt(description: str, action_type: str) -> str:
-    """Build prompt for LLM to generate Solana instruction"""
-    return f"""
+# Prompt bodies are constant apart from the user-supplied fields; build them
+# once at import time and fill placeholders with str.format per call.
+_PROMPT_TEMPLATE = """
 Generate a Solana program instruction for a commitment pool application.
 
 User request: "{description}"
@@ -228,9 +258,13 @@ Rules:
 """
 
 
-def _build_challenge_prompt(description: str, challenge_type: str) -> str:
-    """Build prompt for LLM to generate a ChallengeBlueprint."""
-    return f"""
+@functools.lru_cache(maxsize=512)
+def _build_prompt(description: str, action_type: str) -> str:
+    """Build prompt for LLM to generate Solana instruction"""
+    return _PROMPT_TEMPLATE.format(description=description, action_type=action_type)
+
+
+_CHALLENGE_PROMPT_TEMPLATE = """
 You are configuring a commitment challenge for the Commitment Parties protocol.
 
 User provided this high-level description (verbatim, do not echo it back): "{description}"
@@ -312,6 +346,14 @@ Rules:
 """
 
 
+@functools.lru_cache(maxsize=512)
+def _build_challenge_prompt(description: str, challenge_type: str) -> str:
+    """Build prompt for LLM to generate a ChallengeBlueprint."""
+    return _CHALLENGE_PROMPT_TEMPLATE.format(
+        description=description, challenge_type=challenge_type
+    )
+
+
 @router.post(
     "/generate",
     response_model=OnChainActionResponse,
@@ -333,8 +375,8 @@ async def generate_onchain_action(body: OnChainActionRequest) -> OnChainActionRe
                 text = text[brace_index:]
 
         try:
-            data = json.loads(text)
-        except json.JSONDecodeError as e:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM JSON: {raw}")
             raise HTTPException(
                 status_code=500,
@@ -411,8 +453,8 @@ async def parse_challenge(body: ChallengeParseRequest) -> ChallengeBlueprint:
                 text = text[brace_index:]
 
         try:
-            data = json.loads(text)
-        except json.JSONDecodeError as e:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM JSON for challenge blueprint: {raw}")
             raise HTTPException(
                 status_code=500,
@@ -5,11 +5,14 @@ Handles submission and retrieval of daily check-ins for lifestyle challenges.
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi.responses import ORJSONResponse
+from typing import Dict, List, Tuple
+import asyncio
 import logging
+import time
 
-from models import CheckInCreate, CheckInResponse, ErrorResponse
-from database import execute_query
+from models import CheckInCreate, CheckInBulkCreate, CheckInResponse, ErrorResponse
+from database import execute_query, compile_select
 from utils.timezone import (
     get_eastern_now, get_eastern_timestamp, get_challenge_day_window
 )
@@ -18,6 +21,43 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Pre-bound query shapes for the hot paths; built once at import time
+_select_pool_by_id = compile_select("pools", ("pool_id",), limit=1)
+_select_user_checkins = compile_select(
+    "checkins", ("pool_id", "participant_wallet"), order_by="day"
+)
+
+# Pool start timestamps are effectively immutable once a pool is created, yet
+# every check-in re-reads the same value; a short TTL cache drops that SELECT
+# from the hot path while still picking up scheduler-side changes quickly.
+_POOL_START_TTL = 300.0  # seconds
+_POOL_START_MAX_ENTRIES = 1024
+_pool_start_cache: Dict[int, Tuple[float, int]] = {}
+
+
+async def _get_pool_start(pool_id: int) -> int:
+    """Resolve a pool's start timestamp, cached for a few minutes."""
+    now = time.monotonic()
+    cached = _pool_start_cache.get(pool_id)
+    if cached and now - cached[0] < _POOL_START_TTL:
+        return cached[1]
+
+    pools = await _select_pool_by_id(pool_id)
+
+    if not pools:
+        raise HTTPException(status_code=404, detail="Pool not found")
+
+    pool = pools[0]
+    start_timestamp = pool.get("scheduled_start_time") or pool.get("start_timestamp")
+
+    if not start_timestamp:
+        raise HTTPException(status_code=400, detail="Pool start timestamp not found")
+
+    if len(_pool_start_cache) >= _POOL_START_MAX_ENTRIES:
+        _pool_start_cache.clear()
+    _pool_start_cache[pool_id] = (now, start_timestamp)
+    return start_timestamp
+
 
 @router.post(
     "/",
@@ -26,26 +66,12 @@ router = APIRouter()
     summary="Submit a check-in",
     description="Submit a daily check-in for a lifestyle challenge pool. Must be submitted before the day ends.",
 )
-async def submit_checkin(checkin_data: CheckInCreate) -> CheckInResponse:
+async def submit_checkin(checkin_data: CheckInCreate) -> ORJSONResponse:
     """Submit a daily check-in. Must be submitted before the challenge day ends."""
     try:
-        # Get pool information to validate timing
-        pools = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": checkin_data.pool_id},
-            limit=1
-        )
-        
-        if not pools:
-            raise HTTPException(status_code=404, detail="Pool not found")
-        
-        pool = pools[0]
-        start_timestamp = pool.get("scheduled_start_time") or pool.get("start_timestamp")
-        
-        if not start_timestamp:
-            raise HTTPException(status_code=400, detail="Pool start timestamp not found")
-        
+        # Get the pool's start timestamp to validate timing (TTL-cached)
+        start_timestamp = await _get_pool_start(checkin_data.pool_id)
+
         # Calculate the end of the challenge day for the submitted day (using Eastern Time)
         challenge_day_start, challenge_day_end = get_challenge_day_window(start_timestamp, checkin_data.day)
         
@@ -60,72 +86,109 @@ async def submit_checkin(checkin_data: CheckInCreate) -> CheckInResponse:
         
         # Convert to dict for database insertion
         checkin_dict = checkin_data.model_dump()
-        
-        # Insert or update check-in (handles duplicate day submissions)
-        # Supabase will handle the UNIQUE constraint
+
+        # Insert or update check-in in a single round-trip; duplicate day
+        # submissions hit the UNIQUE(pool_id, participant_wallet, day) constraint
         results = await execute_query(
             table="checkins",
-            operation="insert",
+            operation="upsert",
             data=checkin_dict,
+            on_conflict="pool_id,participant_wallet,day",
         )
-        
-        if not results:
-            # If insert fails due to unique constraint, try update
-            # In production, use upsert
-            try:
-                results = await execute_query(
-                    table="checkins",
-                    operation="update",
-                    filters={
-                        "pool_id": checkin_data.pool_id,
-                        "participant_wallet": checkin_data.participant_wallet,
-                        "day": checkin_data.day,
-                    },
-                    data=checkin_dict,
-                )
-            except:
-                pass
-        
+
         if not results:
             raise HTTPException(status_code=500, detail="Failed to submit check-in")
         
         logger.info(
-            f"Check-in submitted: pool={checkin_data.pool_id}, "
-            f"wallet={checkin_data.participant_wallet}, day={checkin_data.day}"
+            "Check-in submitted: pool=%s, wallet=%s, day=%s",
+            checkin_data.pool_id, checkin_data.participant_wallet, checkin_data.day,
         )
-        return CheckInResponse(**results[0])
+        # Row comes straight from the DB; skip the Pydantic re-validation pass
+        # (response_model is kept on the decorator for OpenAPI docs only)
+        return ORJSONResponse(content=results[0], status_code=201)
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error submitting check-in: {e}", exc_info=True)
+        logger.error("Error submitting check-in: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to submit check-in")
 
 
+@router.post(
+    "/bulk",
+    response_model=List[CheckInResponse],
+    status_code=201,
+    summary="Submit multiple check-ins",
+    description="Submit several daily check-ins at once (e.g. after being offline). Each day must still be open.",
+)
+async def submit_checkins_bulk(bulk_data: CheckInBulkCreate) -> ORJSONResponse:
+    """Submit multiple check-ins as a single batched upsert."""
+    try:
+        # Deduplicate on the conflict key (last item wins): a batch with two
+        # entries for the same (pool, wallet, day) would otherwise make the
+        # multi-row ON CONFLICT upsert fail with Postgres's "cannot affect
+        # row a second time" and surface as an opaque 500
+        items = list({
+            (item.pool_id, item.participant_wallet, item.day): item
+            for item in bulk_data.items
+        }.values())
+
+        # Resolve each referenced pool's start timestamp once, concurrently
+        pool_ids = sorted({item.pool_id for item in items})
+        starts = await asyncio.gather(*[_get_pool_start(pid) for pid in pool_ids])
+        pool_starts = dict(zip(pool_ids, starts))
+
+        # Validate every day window before writing anything
+        current_time = get_eastern_now()
+        for item in items:
+            _, challenge_day_end = get_challenge_day_window(pool_starts[item.pool_id], item.day)
+            if current_time >= challenge_day_end:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Day {item.day} has ended. Check-ins must be submitted before the day ends. "
+                           f"Day ended at {challenge_day_end.isoformat()} (Eastern Time)."
+                )
+
+        # Write the whole batch in one statement: Postgres multi-row
+        # INSERT ... ON CONFLICT costs ~1 round-trip regardless of N
+        rows = await execute_query(
+            table="checkins",
+            operation="upsert",
+            data=[item.model_dump() for item in items],
+            on_conflict="pool_id,participant_wallet,day",
+        )
+
+        if len(rows) != len(items):
+            raise HTTPException(status_code=500, detail="Failed to submit some check-ins")
+
+        logger.info("Bulk check-in submitted: %d check-ins across %d pools", len(rows), len(pool_ids))
+        return ORJSONResponse(content=rows, status_code=201)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error submitting bulk check-ins: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to submit check-ins")
+
+
 @router.get(
     "/{pool_id}/{wallet}",
     response_model=List[CheckInResponse],
     summary="Get user's check-ins",
     description="Get all check-ins for a specific user in a specific pool",
 )
-async def get_user_checkins(pool_id: int, wallet: str) -> List[CheckInResponse]:
+async def get_user_checkins(pool_id: int, wallet: str) -> ORJSONResponse:
     """Get all check-ins for a user in a pool."""
     try:
-        results = await execute_query(
-            table="checkins",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "participant_wallet": wallet,
-            },
-        )
-        
-        # Sort by day
-        results.sort(key=lambda x: x.get("day", 0))
-        
-        return [CheckInResponse(**result) for result in results]
+        # ORDER BY day in the database; the UNIQUE(pool_id, participant_wallet, day)
+        # index returns rows pre-sorted with no extra cost
+        results = await _select_user_checkins(pool_id, wallet)
+
+        # Rows come straight from the DB and match CheckInResponse; return them
+        # directly so serialization uses orjson and skips the Pydantic re-validation pass
+        return ORJSONResponse(content=results)
     
     except Exception as e:
-        logger.error(f"Error fetching check-ins: {e}", exc_info=True)
+        logger.error("Error fetching check-ins: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch check-ins")
 
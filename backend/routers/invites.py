@@ -61,52 +61,38 @@ async def create_invite(pool_id: int, invite_data: InviteCreate) -> InviteRespon
                 detail="Cannot create invites for public pools"
             )
         
-        # Check if invite already exists
-        existing = await execute_query(
-            table="pool_invites",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "invitee_wallet": invite_data.invitee_wallet,
-            },
-            limit=1,
-        )
-        
-        if existing:
-            return InviteResponse(
-                id=existing[0]["id"],
-                pool_id=pool_id,
-                invitee_wallet=invite_data.invitee_wallet,
-                created_at=existing[0]["created_at"].isoformat() if existing[0].get("created_at") else "",
-            )
-        
-        # Create invite
+        # Create invite (or return the existing one) in a single round-trip;
+        # ON CONFLICT (pool_id, invitee_wallet) DO UPDATE ... RETURNING * hands
+        # back the already-existing row instead of erroring on duplicates
         invite_dict = {
             "pool_id": pool_id,
             "invitee_wallet": invite_data.invitee_wallet,
         }
-        
+
         results = await execute_query(
             table="pool_invites",
-            operation="insert",
+            operation="upsert",
             data=invite_dict,
+            on_conflict="pool_id,invitee_wallet",
         )
         
         if not results:
             raise HTTPException(status_code=500, detail="Failed to create invite")
         
         result = results[0]
+        # PostgREST returns timestamptz columns as ISO8601 strings already;
+        # no per-row datetime round-trip needed
         return InviteResponse(
             id=result["id"],
             pool_id=pool_id,
             invitee_wallet=invite_data.invitee_wallet,
-            created_at=result["created_at"].isoformat() if result.get("created_at") else "",
+            created_at=result.get("created_at") or "",
         )
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating invite: {e}", exc_info=True)
+        logger.error("Error creating invite: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to create invite")
 
 
@@ -132,18 +118,12 @@ async def get_pool_invites(
             filters=filters,
         )
         
-        return [
-            InviteResponse(
-                id=r["id"],
-                pool_id=r["pool_id"],
-                invitee_wallet=r["invitee_wallet"],
-                created_at=r["created_at"].isoformat() if r.get("created_at") else "",
-            )
-            for r in results
-        ]
+        # Single pass over the rows via pydantic-core's C path; PostgREST
+        # already returns created_at as an ISO string
+        return list(map(InviteResponse.model_validate, results))
     
     except Exception as e:
-        logger.error(f"Error fetching invites: {e}", exc_info=True)
+        logger.error("Error fetching invites: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch invites")
 
 
@@ -158,24 +138,23 @@ async def check_invite(
 ) -> dict:
     """Check if a wallet has an invite to a pool."""
     try:
-        results = await execute_query(
+        has_invite = await execute_query(
             table="pool_invites",
-            operation="select",
+            operation="exists",
             filters={
                 "pool_id": pool_id,
                 "invitee_wallet": invitee_wallet,
             },
-            limit=1,
         )
-        
+
         return {
-            "has_invite": len(results) > 0,
+            "has_invite": has_invite,
             "pool_id": pool_id,
             "invitee_wallet": invitee_wallet,
         }
     
     except Exception as e:
-        logger.error(f"Error checking invite: {e}", exc_info=True)
+        logger.error("Error checking invite: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to check invite")
 
 
@@ -5,7 +5,10 @@ Handles CRUD operations for commitment pools.
 """
 
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
-from typing import Optional, List
+from fastapi.responses import ORJSONResponse
+from typing import Optional, List, Dict, Tuple
+import asyncio
+import functools
 import logging
 import time
 from datetime import datetime, timezone, timedelta
@@ -15,7 +18,7 @@ import base64
 from io import BytesIO
 
 from models import PoolCreate, PoolResponse, ErrorResponse, PoolConfirmRequest, JoinPoolConfirmRequest, ForfeitPoolConfirmRequest
-from database import execute_query
+from database import execute_query, execute_rpc
 from config import settings
 from utils.timezone import (
     get_eastern_now, get_eastern_timestamp, calculate_current_day,
@@ -23,13 +26,40 @@ from utils.timezone import (
 )
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TokenAccountOpts
 from solders.pubkey import Pubkey
 
+from utils.twitter import get_twitter_poster
+
+# Second-based interval constants used throughout the recruitment/day-window math
+_HOUR = 3600
+_DAY = 86400
+
+# Upload cap for screen-time screenshots
+_MAX_SCREENSHOT_BYTES = 5 * 1024 * 1024
+
+
+def _next_window_end(start_timestamp: int, now: int) -> int:
+    """End of the current daily verification window, in epoch seconds.
+
+    Pure integer arithmetic - one floor division, no datetime objects. The
+    max() clamp covers a pool marked active before its start time: elapsed
+    days clamp to zero, yielding the end of day one.
+    """
+    days_elapsed = max(0, (now - start_timestamp) // _DAY)
+    return start_timestamp + (days_elapsed + 1) * _DAY
+
 # Initialize logger first before any try/except blocks that use it
 logger = logging.getLogger(__name__)
 
-# Try to import agent modules (for advanced features)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'agent', 'src'))
+# Try to import agent modules (for advanced features). Guard the path
+# insert: repeated inserts (e.g. under test re-imports or uvicorn reload)
+# would grow sys.path and lengthen every subsequent import's scan.
+_AGENT_SRC = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'agent', 'src')
+)
+if _AGENT_SRC not in sys.path:
+    sys.path.insert(0, _AGENT_SRC)
 try:
     from monitor import Monitor
     from solana_client import SolanaClient
@@ -71,6 +101,234 @@ async def get_solana_client() -> AsyncClient:
     return _solana_client
 
 
+# Lazy singleton for the agent Monitor (only when agent modules import).
+# Building SolanaClient + Verifier + Monitor per request paid RPC
+# connection setup on every manual verification; the lock keeps concurrent
+# first requests from initializing twice.
+_monitor: Optional["Monitor"] = None
+_monitor_lock = asyncio.Lock()
+
+
+async def get_monitor() -> "Monitor":
+    """Get or create the shared agent Monitor (initialized once)."""
+    global _monitor
+    if _monitor is None:
+        async with _monitor_lock:
+            if _monitor is None:
+                solana_client = SolanaClient(
+                    rpc_url=settings.SOLANA_RPC_URL,
+                    program_id=settings.PROGRAM_ID,
+                )
+                await solana_client.initialize()
+                verifier = Verifier(solana_client)
+                _monitor = Monitor(solana_client, verifier)
+                logger.info("Initialized shared agent Monitor for manual verifications")
+    return _monitor
+
+
+# The program id is parsed once at import; PDA derivations are pure functions
+# of (pool_id, wallet) and repeat for every participant in a pool (the bump
+# search inside find_program_address hashes up to 255 times), so memoize them.
+_PROGRAM_ID: Optional["Pubkey"] = None
+if SOLDERS_AVAILABLE and settings.PROGRAM_ID:
+    try:
+        _PROGRAM_ID = Pubkey.from_string(settings.PROGRAM_ID)
+    except Exception as e:
+        logger.warning(f"Invalid PROGRAM_ID {settings.PROGRAM_ID!r}: {e}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _derive_pool_pubkey(pool_id: int) -> "Pubkey":
+    """Derive the pool PDA: seeds = [b"pool", pool_id.to_le_bytes()]."""
+    pool_seeds = [b"pool", pool_id.to_bytes(8, "little")]
+    return Pubkey.find_program_address(pool_seeds, _PROGRAM_ID)[0]
+
+
+@functools.lru_cache(maxsize=4096)
+def _derive_participant_pubkey(pool_id: int, participant_wallet: str) -> str:
+    """Derive the participant PDA: seeds = [b"participant", pool PDA, wallet]."""
+    pool_pubkey = _derive_pool_pubkey(pool_id)
+    participant_wallet_pubkey = Pubkey.from_string(participant_wallet)
+    participant_seeds = [b"participant", bytes(pool_pubkey), bytes(participant_wallet_pubkey)]
+    return str(Pubkey.find_program_address(participant_seeds, _PROGRAM_ID)[0])
+
+
+# In-process read-through cache for single-pool reads. This deployment has no
+# Redis; a short-TTL dict gives the same hot-read relief per process and is
+# invalidated on every pool write in this router.
+_POOL_CACHE_TTL = 10.0  # seconds
+_pool_cache: Dict[int, Tuple[float, dict]] = {}
+
+# Same idea for listings, keyed on the full query shape. Any pool write
+# clears the whole listing cache - listings are cheap to rebuild and write
+# endpoints are rare relative to reads.
+_POOL_LIST_TTL = 10.0  # seconds
+_POOL_LIST_MAX_ENTRIES = 256
+_pool_list_cache: Dict[Tuple, Tuple[float, list]] = {}
+
+
+def _invalidate_pool_cache(pool_id: Optional[int] = None) -> None:
+    """Drop cached pool rows and listings after a write (all rows when
+    pool_id is None)."""
+    if pool_id is None:
+        _pool_cache.clear()
+    else:
+        _pool_cache.pop(pool_id, None)
+    _pool_list_cache.clear()
+
+
+async def _get_pool_cached(pool_id: int) -> Optional[dict]:
+    """
+    Fetch a pool row through the short-TTL cache (None when absent).
+
+    The fields the read handlers need (start_timestamp, goal_metadata,
+    status) are effectively static between writes, and every write in this
+    router invalidates the cache, so a brief TTL is safe.
+    """
+    now = time.monotonic()
+    cached = _pool_cache.get(pool_id)
+    if cached and now - cached[0] < _POOL_CACHE_TTL:
+        return cached[1]
+
+    results = await execute_query(
+        table="pools",
+        operation="select",
+        filters={"pool_id": pool_id},
+        limit=1,
+    )
+    if not results:
+        return None
+
+    _pool_cache[pool_id] = (now, results[0])
+    return results[0]
+
+
+def _compute_pool_times(pool_dict: dict, pool_id: int) -> None:
+    """
+    Normalize recruitment/participant fields and set the recruiting-phase
+    timestamps on a pool dict, in place.
+
+    All challenges start in the recruiting phase: the recruitment period is
+    clamped to 1 day..2 weeks, participant bounds to 5 <= min <= max <= 50,
+    and start/end timestamps are placeholders until the challenge actually
+    starts (when filled or at auto_start_time).
+    """
+    pool_dict["participant_count"] = 0
+    pool_dict["total_staked"] = 0.0
+    pool_dict["yield_earned"] = 0.0
+
+    current_time = get_eastern_timestamp()  # Use Eastern Time
+
+    # Remove fields that don't exist in database schema
+    pool_dict.pop("transaction_signature", None)
+
+    # Get values - ensure we have valid integers (MUST be before enforcement logic)
+    min_participants = pool_dict.get("min_participants")
+    max_participants = pool_dict.get("max_participants")
+
+    if max_participants is None:
+        logger.error("max_participants is missing from pool_dict")
+        raise HTTPException(status_code=400, detail="max_participants is required")
+
+    try:
+        max_participants = int(max_participants)
+    except (ValueError, TypeError):
+        logger.error(f"Invalid max_participants value: {max_participants}")
+        raise HTTPException(status_code=400, detail=f"Invalid max_participants: {max_participants}")
+
+    if min_participants is None:
+        min_participants = 1
+    else:
+        try:
+            min_participants = int(min_participants)
+        except (ValueError, TypeError):
+            logger.warning(f"Invalid min_participants value: {min_participants}, defaulting to 1")
+            min_participants = 1
+
+    # Enforce recruitment period: min 1 day (24 hours), default 1 week (168 hours), max 2 weeks (336 hours)
+    recruitment_hours = pool_dict.get("recruitment_period_hours", 168)
+    if recruitment_hours > 336:  # Max 2 weeks
+        recruitment_hours = 336
+        logger.warning(f"Recruitment period capped at 2 weeks (336 hours) for pool {pool_id}")
+    elif recruitment_hours < 24:  # Minimum 1 day
+        recruitment_hours = 24
+        logger.info(f"Recruitment period set to minimum 1 day (24 hours) for pool {pool_id}")
+
+    # Set recruitment_deadline = now + recruitment_period
+    recruitment_deadline = current_time + (recruitment_hours * _HOUR)
+    pool_dict["recruitment_deadline"] = recruitment_deadline
+
+    # NEW RECRUITMENT SYSTEM: Enforce min_participants >= 5, max_participants <= 50
+    if min_participants < 5:
+        min_participants = 5
+    if max_participants > 50:
+        max_participants = 50
+
+    # CRITICAL: Ensure min_participants <= max_participants (database constraint)
+    if min_participants > max_participants:
+        logger.warning(f"min_participants ({min_participants}) > max_participants ({max_participants}). Setting to 5.")
+        min_participants = 5
+
+    pool_dict["min_participants"] = min_participants
+    pool_dict["max_participants"] = max_participants
+    pool_dict.setdefault("recruitment_period_hours", 168)  # Default 1 week
+    pool_dict["require_min_participants"] = True  # All challenges now require minimum participants
+
+    # Challenge starts in recruiting phase - status stays "pending";
+    # start/end timestamps are placeholders updated when the challenge starts
+    pool_dict["start_timestamp"] = recruitment_deadline
+    pool_dict["end_timestamp"] = pool_dict["start_timestamp"] + (pool_dict["duration_days"] * _DAY)
+    pool_dict["status"] = "pending"
+    pool_dict["filled_at"] = None
+    pool_dict["auto_start_time"] = None
+
+
+# Wallets ensured recently don't need re-ensuring: users rows are never
+# deleted in normal operation, so a short memo skips the round-trip when the
+# same wallet creates and confirms (or joins several pools) in succession
+_ENSURED_USER_TTL = 60.0  # seconds
+_ENSURED_USER_MAX_ENTRIES = 10_000
+_ensured_users: Dict[str, float] = {}
+
+
+async def _ensure_user(wallet_address: str) -> None:
+    """
+    Ensure a users row exists for the wallet (auto-create if not).
+
+    One ON CONFLICT DO NOTHING round-trip, memoized per wallet for a minute:
+    concurrent creations can't race and existing rows are left untouched.
+    Failures are logged but never block the pool flow that needed the user.
+    """
+    now = time.monotonic()
+    ensured_at = _ensured_users.get(wallet_address)
+    if ensured_at is not None and now - ensured_at < _ENSURED_USER_TTL:
+        return
+
+    user_data = {
+        "wallet_address": wallet_address,
+        "username": None,
+        "twitter_handle": None,
+        "reputation_score": 100,
+        "total_games": 0,
+        "games_completed": 0,
+        "total_earned": 0.0,
+        "streak_count": 0
+    }
+    try:
+        await execute_query(
+            table="users",
+            operation="upsert",
+            data=user_data,
+            on_conflict="wallet_address",
+            ignore_duplicates=True,
+        )
+        if len(_ensured_users) >= _ENSURED_USER_MAX_ENTRIES:
+            _ensured_users.clear()
+        _ensured_users[wallet_address] = now
+    except Exception as e:
+        logger.warning(f"Error ensuring user {wallet_address}: {e}")
+
+
 @router.get(
     "",
     response_model=List[PoolResponse],
@@ -82,7 +340,7 @@ async def list_pools(
     limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     wallet: Optional[str] = Query(None, description="Wallet address for filtering private pools"),
-) -> List[PoolResponse]:
+) -> ORJSONResponse:
     """
     List all active pools.
     
@@ -92,67 +350,77 @@ async def list_pools(
     - wallet has an invite
     """
     try:
-        # Get all pools
-        results = await execute_query(
-            table="pools",
-            operation="select",
-            limit=limit * 2,  # Get more to account for filtering
-        )
-        
-        # Filter by status if provided
-        if status:
-            results = [r for r in results if r.get("status") == status]
-        # If no status filter, return all pools (frontend handles filtering)
-        
+        # Short-TTL response cache: listings change on a human time scale and
+        # every pool write in this router clears the cache, so hits skip the
+        # database entirely
+        cache_key = (status, limit, offset, wallet)
+        now = time.monotonic()
+        cached = _pool_list_cache.get(cache_key)
+        if cached and now - cached[0] < _POOL_LIST_TTL:
+            return ORJSONResponse(content=cached[1])
+
+        # Status filtering happens in the database; without a status filter all
+        # pools are returned (frontend handles filtering)
+        status_filter = {"status": status} if status else None
+
         # Filter by public/private visibility and exclude pools user already joined
         if wallet:
-            # Get pools user is already a participant in
-            user_participants = await execute_query(
-                table="participants",
+            # Resolve the wallet's joined pools and invites concurrently; both
+            # are id-only projections
+            user_participants, invites = await asyncio.gather(
+                execute_query(
+                    table="participants",
+                    operation="select",
+                    filters={"wallet_address": wallet},
+                    columns="pool_id",
+                ),
+                execute_query(
+                    table="pool_invites",
+                    operation="select",
+                    filters={"invitee_wallet": wallet},
+                    columns="pool_id",
+                ),
+            )
+            joined_pool_ids = [p["pool_id"] for p in user_participants if p.get("pool_id")]
+            invited_ids = sorted({r["pool_id"] for r in invites if r.get("pool_id")})
+
+            # Visibility pushed into PostgREST: public pools, own pools, or
+            # private pools the wallet was invited to. Wallets are base58
+            # (alphanumeric), so the creator clause is skipped for anything
+            # that could break the disjunction syntax - such a wallet cannot
+            # own pools anyway.
+            or_parts = ["is_public.eq.true"]
+            if wallet.isalnum():
+                or_parts.append(f"creator_wallet.eq.{wallet}")
+            if invited_ids:
+                or_parts.append("pool_id.in.({})".format(",".join(str(i) for i in invited_ids)))
+
+            # With every predicate in SQL, pagination is exact and runs in the
+            # database too
+            results = await execute_query(
+                table="pools",
                 operation="select",
-                filters={"wallet_address": wallet},
+                filters=status_filter,
+                not_in_filters={"pool_id": joined_pool_ids} if joined_pool_ids else None,
+                or_filters=",".join(or_parts),
+                order_by="created_at",
+                descending=True,
+                limit=limit,
+                offset=offset,
             )
-            joined_pool_ids = {p.get("pool_id") for p in user_participants if p.get("pool_id")}
-            
-            filtered_results = []
-            for pool in results:
-                pool_id = pool.get("pool_id")
-                
-                # Skip pools user is already in
-                if pool_id in joined_pool_ids:
-                    continue
-                
-                is_public = pool.get("is_public", True)
-                creator_wallet = pool.get("creator_wallet")
-                
-                if is_public:
-                    # Public pools: show to everyone
-                    filtered_results.append(pool)
-                elif creator_wallet == wallet:
-                    # Private pools: show to creator
-                    filtered_results.append(pool)
-                else:
-                    # Private pools: check if wallet has invite
-                    from database import execute_query as db_query
-                    invites = await db_query(
-                        table="pool_invites",
-                        operation="select",
-                        filters={
-                            "pool_id": pool_id,
-                            "invitee_wallet": wallet,
-                        },
-                        limit=1,
-                    )
-                    if invites:
-                        filtered_results.append(pool)
-            results = filtered_results
         else:
-            # No wallet provided: only show public pools
-            results = [r for r in results if r.get("is_public", True)]
-        
-        # Apply offset and limit
-        results = results[offset:offset + limit]
-        
+            # No wallet provided: only show public pools; filtering and
+            # pagination both run in the database
+            results = await execute_query(
+                table="pools",
+                operation="select",
+                filters={**(status_filter or {}), "is_public": True},
+                order_by="created_at",
+                descending=True,
+                limit=limit,
+                offset=offset,
+            )
+
         # Ensure all required fields are present with defaults
         def ensure_pool_fields(pool_dict: dict) -> dict:
             """Ensure all required PoolResponse fields have values"""
@@ -164,8 +432,16 @@ async def list_pools(
             pool_dict.setdefault("status", pool_dict.get("status", "pending"))
             pool_dict.setdefault("is_public", pool_dict.get("is_public", True))
             return pool_dict
-        
-        return [PoolResponse(**ensure_pool_fields(result)) for result in results]
+
+        # Rows come straight from the DB; serialize them with orjson and skip
+        # the per-row Pydantic re-validation pass (response_model stays on the
+        # decorator for OpenAPI docs only)
+        content = [ensure_pool_fields(result) for result in results]
+
+        if len(_pool_list_cache) >= _POOL_LIST_MAX_ENTRIES:
+            _pool_list_cache.clear()
+        _pool_list_cache[cache_key] = (now, content)
+        return ORJSONResponse(content=content)
     
     except Exception as e:
         logger.error(f"Error listing pools: {e}", exc_info=True)
@@ -179,20 +455,17 @@ async def list_pools(
     description="Get detailed information about a specific pool",
     responses={404: {"model": ErrorResponse}},
 )
-async def get_pool(pool_id: int) -> PoolResponse:
+async def get_pool(pool_id: int) -> ORJSONResponse:
     """Get a specific pool by ID."""
     try:
-        results = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_id},
-            limit=1,
-        )
-        
-        if not results:
+        pool = await _get_pool_cached(pool_id)
+
+        if pool is None:
             raise HTTPException(status_code=404, detail="Pool not found")
-        
-        return PoolResponse(**results[0])
+
+        # Row comes straight from the DB; serialize with orjson and skip the
+        # Pydantic re-validation pass (response_model stays for OpenAPI docs)
+        return ORJSONResponse(content=pool)
     
     except HTTPException:
         raise
@@ -212,38 +485,8 @@ async def create_pool(pool_data: PoolCreate) -> PoolResponse:
     """Create a new commitment pool."""
     try:
         # Ensure creator user exists (auto-create if not)
-        creator_wallet = pool_data.creator_wallet
-        try:
-            users = await execute_query(
-                table="users",
-                operation="select",
-                filters={"wallet_address": creator_wallet},
-                limit=1
-            )
-            
-            if not users:
-                # Auto-create user
-                user_data = {
-                    "wallet_address": creator_wallet,
-                    "username": None,
-                    "twitter_handle": None,
-                    "reputation_score": 100,
-                    "total_games": 0,
-                    "games_completed": 0,
-                    "total_earned": 0.0,
-                    "streak_count": 0
-                }
-                await execute_query(
-                    table="users",
-                    operation="insert",
-                    data=user_data
-                )
-                logger.info(f"Auto-created user {creator_wallet}")
-        except Exception as e:
-            # User might already exist (race condition), continue anyway
-            if "unique" not in str(e).lower() and "duplicate" not in str(e).lower():
-                logger.warning(f"Error checking/creating user: {e}")
-        
+        await _ensure_user(pool_data.creator_wallet)
+
         # Convert to dict for database insertion
         pool_dict = pool_data.model_dump()
         pool_dict["status"] = "pending"
@@ -286,9 +529,10 @@ async def create_pool(pool_data: PoolCreate) -> PoolResponse:
         
         if not results:
             raise HTTPException(status_code=500, detail="Failed to create pool")
-        
+
+        _invalidate_pool_cache(pool_data.pool_id)
         logger.info(f"Created pool {pool_data.pool_id}")
-        return PoolResponse(**results[0])
+        return PoolResponse.model_validate(results[0])
     
     except HTTPException:
         raise
@@ -308,231 +552,18 @@ async def confirm_pool_creation(pool_data: PoolConfirmRequest) -> PoolResponse:
     """Confirm pool creation after on-chain transaction."""
     try:
         # Ensure creator user exists (auto-create if not)
-        creator_wallet = pool_data.creator_wallet
-        try:
-            users = await execute_query(
-                table="users",
-                operation="select",
-                filters={"wallet_address": creator_wallet},
-                limit=1
-            )
-            
-            if not users:
-                # Auto-create user
-                user_data = {
-                    "wallet_address": creator_wallet,
-                    "username": None,
-                    "twitter_handle": None,
-                    "reputation_score": 100,
-                    "total_games": 0,
-                    "games_completed": 0,
-                    "total_earned": 0.0,
-                    "streak_count": 0
-                }
-                await execute_query(
-                    table="users",
-                    operation="insert",
-                    data=user_data
-                )
-                logger.info(f"Auto-created user {creator_wallet}")
-        except Exception as e:
-            # User might already exist (race condition), continue anyway
-            if "unique" not in str(e).lower() and "duplicate" not in str(e).lower():
-                logger.warning(f"Error checking/creating user: {e}")
-        
-        # Check if pool already exists
-        existing = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_data.pool_id},
-            limit=1
-        )
-        
-        if existing:
-            logger.warning(f"Pool {pool_data.pool_id} already exists, updating...")
-            # Update existing pool with transaction signature
-            pool_dict = pool_data.model_dump()
-            pool_dict["participant_count"] = 0
-            pool_dict["total_staked"] = 0.0
-            pool_dict["yield_earned"] = 0.0
-            
-            # NEW RECRUITMENT SYSTEM: All challenges start in recruiting phase
-            current_time = get_eastern_timestamp()  # Use Eastern Time
-            
-            # Remove fields that don't exist in database schema
-            pool_dict.pop("transaction_signature", None)
-            
-            # Get values - ensure we have valid integers (MUST be before enforcement logic)
-            min_participants = pool_dict.get("min_participants", 1)
-            max_participants = pool_dict.get("max_participants")
-            
-            # Ensure max_participants is valid
-            if max_participants is None:
-                logger.error("max_participants is missing from pool_dict")
-                raise HTTPException(status_code=400, detail="max_participants is required")
-            
-            # Convert to int if needed
-            try:
-                max_participants = int(max_participants)
-            except (ValueError, TypeError):
-                logger.error(f"Invalid max_participants value: {max_participants}")
-                raise HTTPException(status_code=400, detail=f"Invalid max_participants: {max_participants}")
-            
-            # Convert min_participants to int
-            try:
-                min_participants = int(min_participants) if min_participants is not None else 1
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid min_participants value: {min_participants}, defaulting to 1")
-                min_participants = 1
-            
-            # Enforce recruitment period: min 1 day (24 hours), default 1 week (168 hours), max 2 weeks (336 hours)
-            recruitment_hours = pool_dict.get("recruitment_period_hours", 168)  # Default to 1 week
-            if recruitment_hours > 336:  # Max 2 weeks
-                recruitment_hours = 336
-            elif recruitment_hours < 24:  # Minimum 1 day
-                recruitment_hours = 24
-            
-            # Set recruitment_deadline = now + recruitment_period
-            recruitment_deadline = current_time + (recruitment_hours * 3600)
-            pool_dict["recruitment_deadline"] = recruitment_deadline
-            
-            # NEW RECRUITMENT SYSTEM: Enforce min_participants >= 5, max_participants <= 50
-            if min_participants < 5:
-                min_participants = 5
-            if max_participants > 50:
-                max_participants = 50
-            
-            # CRITICAL: Ensure min_participants <= max_participants
-            if min_participants > max_participants:
-                logger.warning(f"min_participants ({min_participants}) > max_participants ({max_participants}). Setting to 5.")
-                min_participants = 5
-            
-            # All challenges now require minimum participants
-            pool_dict["require_min_participants"] = True
-            pool_dict["min_participants"] = min_participants
-            pool_dict["max_participants"] = max_participants
-            
-            # Challenge starts in recruiting phase
-            pool_dict["start_timestamp"] = recruitment_deadline  # Placeholder
-            pool_dict["end_timestamp"] = pool_dict["start_timestamp"] + (pool_dict["duration_days"] * 86400)  # Placeholder
-            pool_dict["status"] = "pending"  # Recruiting phase
-            pool_dict["filled_at"] = None
-            pool_dict["auto_start_time"] = None
-            
-            # CRITICAL: Ensure min_participants <= max_participants (database constraint)
-            if min_participants > max_participants:
-                logger.warning(
-                    f"min_participants ({min_participants}) > max_participants ({max_participants}). "
-                    f"Setting min_participants to 1 to satisfy database constraint."
-                )
-                min_participants = 1
-            
-            if min_participants < 1:
-                min_participants = 1
-            
-            pool_dict["min_participants"] = min_participants
-            pool_dict.setdefault("recruitment_period_hours", 168)  # Default 1 week (168 hours)
-            pool_dict.setdefault("require_min_participants", False)  # Default false
-            # scheduled_start_time is calculated above and kept (nullable, so None is fine)
-            
-            results = await execute_query(
-                table="pools",
-                operation="update",
-                filters={"pool_id": pool_data.pool_id},
-                data=pool_dict
-            )
-            
-            if not results:
-                raise HTTPException(status_code=500, detail="Failed to update pool")
-            
-            return PoolResponse(**results[0])
-        
-        # Convert to dict for database insertion
+        await _ensure_user(pool_data.creator_wallet)
+
+        # Build the row once; INSERT ... ON CONFLICT (pool_id) DO UPDATE
+        # RETURNING * creates the pool or refreshes an existing one (e.g. a
+        # confirm retry) in a single round-trip, with no TOCTOU window
+        # between an existence check and the write
         pool_dict = pool_data.model_dump()
-        pool_dict["participant_count"] = 0
-        pool_dict["total_staked"] = 0.0
-        pool_dict["yield_earned"] = 0.0
-        
-        # NEW RECRUITMENT SYSTEM: All challenges start in recruiting phase
-        # Default recruitment period: 1 week (7 days), max allowed: 2 weeks (14 days)
-        current_time = get_eastern_timestamp()  # Use Eastern Time
-        
-        # Enforce recruitment period: min 1 day (24 hours), default 1 week (168 hours), max 2 weeks (336 hours)
-        recruitment_hours = pool_dict.get("recruitment_period_hours", 168)  # Default to 1 week (168 hours)
-        if recruitment_hours > 336:  # Max 2 weeks (336 hours)
-            recruitment_hours = 336
-            logger.warning(f"Recruitment period capped at 2 weeks (336 hours) for pool {pool_data.pool_id}")
-        elif recruitment_hours < 24:  # Minimum 1 day (24 hours)
-            recruitment_hours = 24
-            logger.info(f"Recruitment period set to minimum 1 day (24 hours) for pool {pool_data.pool_id}")
-        
-        # Set recruitment_deadline = now + recruitment_period
-        recruitment_deadline = current_time + (recruitment_hours * 3600)
-        pool_dict["recruitment_deadline"] = recruitment_deadline
-        
-        # Remove fields that don't exist in database schema
-        pool_dict.pop("transaction_signature", None)  # Not in schema
-        
-        # Get values - ensure we have valid integers (MUST be before enforcement logic)
-        min_participants = pool_dict.get("min_participants")
-        max_participants = pool_dict.get("max_participants")
-        
-        # Ensure max_participants is valid
-        if max_participants is None:
-            logger.error("max_participants is missing from pool_dict")
-            raise HTTPException(status_code=400, detail="max_participants is required")
-        
-        # Convert to int if needed
-        try:
-            max_participants = int(max_participants)
-        except (ValueError, TypeError):
-            logger.error(f"Invalid max_participants value: {max_participants}")
-            raise HTTPException(status_code=400, detail=f"Invalid max_participants: {max_participants}")
-        
-        # Get min_participants or default to 1
-        if min_participants is None:
-            min_participants = 1
-        else:
-            try:
-                min_participants = int(min_participants)
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid min_participants value: {min_participants}, defaulting to 1")
-                min_participants = 1
-        
-        # NEW RECRUITMENT SYSTEM: Enforce min_participants >= 5, max_participants <= 50
-        if min_participants < 5:
-            logger.warning(f"min_participants ({min_participants}) < 5. Setting to 5.")
-            min_participants = 5
-        if max_participants > 50:
-            logger.warning(f"max_participants ({max_participants}) > 50. Setting to 50.")
-            max_participants = 50
-        
-        # CRITICAL: Ensure min_participants <= max_participants (database constraint check_participant_range)
-        if min_participants > max_participants:
-            logger.warning(
-                f"min_participants ({min_participants}) > max_participants ({max_participants}). "
-                f"Setting min_participants to 5 to satisfy database constraint."
-            )
-            min_participants = 5
-        
+        _compute_pool_times(pool_dict, pool_data.pool_id)
+
         # Log final values for debugging
-        logger.info(f"Pool creation: min_participants={min_participants}, max_participants={max_participants}")
-        
-        pool_dict["min_participants"] = min_participants
-        pool_dict["max_participants"] = max_participants
-        pool_dict.setdefault("recruitment_period_hours", 168)  # Default 1 week
-        pool_dict["require_min_participants"] = True  # NEW: Always required
-        
-        # Challenge starts in recruiting phase - status stays "pending"
-        # start_timestamp will be set when challenge actually starts (after filling or at auto_start_time)
-        # For now, set a placeholder start_timestamp (will be updated when challenge starts)
-        # end_timestamp will be calculated from actual start_timestamp + duration_days
-        pool_dict["start_timestamp"] = recruitment_deadline  # Placeholder, will be updated
-        pool_dict["end_timestamp"] = pool_dict["start_timestamp"] + (pool_dict["duration_days"] * 86400)  # Placeholder
-        pool_dict["status"] = "pending"  # Recruiting phase
-        pool_dict["filled_at"] = None  # Not filled yet
-        pool_dict["auto_start_time"] = None  # Will be set when filled
-        
+        logger.info(f"Pool creation: min_participants={pool_dict['min_participants']}, max_participants={pool_dict['max_participants']}")
+
         # NOTE: If you've added new required columns to the pools table that aren't in the schema.sql file,
         # add default/filler values here. For example:
         # pool_dict.setdefault("new_field_name", "default_value")
@@ -542,12 +573,13 @@ async def confirm_pool_creation(pool_data: PoolConfirmRequest) -> PoolResponse:
         # - String fields: "" or "default"
         # - Timestamp fields: current timestamp or None
         
-        # Insert into database
+        # Write to database (insert or update in one statement)
         try:
             results = await execute_query(
                 table="pools",
-                operation="insert",
+                operation="upsert",
                 data=pool_dict,
+                on_conflict="pool_id",
             )
         except Exception as db_err:
             error_msg = str(db_err)
@@ -568,7 +600,8 @@ async def confirm_pool_creation(pool_data: PoolConfirmRequest) -> PoolResponse:
         
         created_pool = results[0]
         pool_id = created_pool.get("pool_id")
-        
+
+        _invalidate_pool_cache(pool_id)
         logger.info(f"Confirmed pool creation {pool_id} with signature {pool_data.transaction_signature}")
         
         # Ensure all required fields are present
@@ -582,9 +615,6 @@ async def confirm_pool_creation(pool_data: PoolConfirmRequest) -> PoolResponse:
         
         # Trigger Twitter post for new pool (non-blocking background task)
         try:
-            from utils.twitter import get_twitter_poster
-            import asyncio
-            
             twitter_poster = get_twitter_poster()
             if twitter_poster.twitter_enabled:
                 # Post tweet in background (don't block the response)
@@ -603,7 +633,7 @@ async def confirm_pool_creation(pool_data: PoolConfirmRequest) -> PoolResponse:
             # Don't fail pool creation if Twitter posting fails
             logger.warning(f"Failed to queue Twitter post for pool {pool_id}: {e}", exc_info=True)
         
-        return PoolResponse(**created_pool)
+        return PoolResponse.model_validate(created_pool)
     
     except HTTPException:
         raise
@@ -644,62 +674,73 @@ async def get_participant_verifications(
 ) -> dict:
     """Get verification status for a participant."""
     try:
-        # Get participant info
-        participants = await execute_query(
-            table="participants",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "wallet_address": wallet
-            },
-            limit=1
+        async def fetch_verification_summary() -> dict:
+            """Aggregate verifications in the database (one scan, no N-row
+            transfer); falls back to fetching the rows if the SQL function
+            from backend/sql/ is not deployed yet."""
+            try:
+                rows = await execute_rpc(
+                    "get_participant_verification_summary",
+                    {"p_pool_id": pool_id, "p_wallet": wallet},
+                )
+                if rows and isinstance(rows[0], dict):
+                    return rows[0]
+            except Exception as e:
+                logger.warning(f"Verification summary RPC unavailable, falling back: {e}")
+
+            verifications = await execute_query(
+                table="verifications",
+                operation="select",
+                filters={
+                    "pool_id": pool_id,
+                    "participant_wallet": wallet
+                }
+            )
+            return {
+                "total": len(verifications),
+                "passed": len([v for v in verifications if v.get("passed")]),
+                "rows": [
+                    {
+                        "day": v.get("day"),
+                        "passed": v.get("passed"),
+                        "verification_type": v.get("verification_type"),
+                        "verified_at": v.get("verified_at")
+                    }
+                    for v in verifications
+                ],
+            }
+
+        # The three lookups are independent; overlap their round-trips
+        participants, summary, pool_row = await asyncio.gather(
+            execute_query(
+                table="participants",
+                operation="select",
+                filters={
+                    "pool_id": pool_id,
+                    "wallet_address": wallet
+                },
+                limit=1
+            ),
+            fetch_verification_summary(),
+            _get_pool_cached(pool_id),
         )
-        
+
         if not participants:
             raise HTTPException(status_code=404, detail="Participant not found in pool")
-        
+
         participant = participants[0]
-        
-        # Get all verifications
-        verifications = await execute_query(
-            table="verifications",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "participant_wallet": wallet
-            }
-        )
-        
-        # Get pool info for context
-        pools = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_id},
-            limit=1
-        )
-        
-        pool = pools[0] if pools else {}
+
+        pool = pool_row or {}
         current_time = get_eastern_timestamp()  # Use Eastern Time
         start_timestamp = pool.get("start_timestamp", 0)
         pool_status = pool.get("status", "pending")
         current_day = calculate_current_day(start_timestamp, current_time)
 
-        # Calculate next verification window end (approximate daily windows) in Eastern Time
-        # Only calculate for active pools - pending pools should not have verification windows yet
+        # Next verification window end (approximate daily windows, Eastern
+        # Time). Only for active pools - pending pools have no windows yet.
         next_window_end = None
         if pool_status == "active" and start_timestamp:
-            if current_time < start_timestamp:
-                # Pool marked as active but hasn't started yet (edge case)
-                # First window ends after first day
-                next_window_end = start_timestamp + 86400
-            else:
-                days_elapsed = (current_time - start_timestamp) // 86400
-                window_end = start_timestamp + (days_elapsed + 1) * 86400
-                if current_time <= window_end:
-                    next_window_end = window_end
-                else:
-                    # Move to next day
-                    next_window_end = start_timestamp + (days_elapsed + 2) * 86400
+            next_window_end = _next_window_end(start_timestamp, current_time)
 
         return {
             "pool_id": pool_id,
@@ -707,17 +748,9 @@ async def get_participant_verifications(
             "days_verified": participant.get("days_verified", 0),
             "status": participant.get("status", "active"),
             "current_day": current_day,
-            "verifications": [
-                {
-                    "day": v.get("day"),
-                    "passed": v.get("passed"),
-                    "verification_type": v.get("verification_type"),
-                    "verified_at": v.get("verified_at")
-                }
-                for v in verifications
-            ],
-            "total_verifications": len(verifications),
-            "passed_verifications": len([v for v in verifications if v.get("passed")]),
+            "verifications": summary.get("rows", []),
+            "total_verifications": summary.get("total", 0),
+            "passed_verifications": summary.get("passed", 0),
             "next_window_end": next_window_end,
         }
     
@@ -736,18 +769,21 @@ async def get_participant_verifications(
 async def get_pool_stats(pool_id: int) -> dict:
     """Get aggregate stats for a pool."""
     try:
-        participants = await execute_query(
-            table="participants",
-            operation="select",
-            filters={"pool_id": pool_id},
-        )
-        started = len(participants)
-        remaining = len(
-            [
-                p
-                for p in participants
-                if p.get("status") in ("active", "pending", None)
-            ]
+        # Two head/count queries (no rows transferred), overlapped; the
+        # (pool_id, status) index serves both. status is NOT NULL with a
+        # default, so the old None branch was dead code.
+        started, remaining = await asyncio.gather(
+            execute_query(
+                table="participants",
+                operation="count",
+                filters={"pool_id": pool_id},
+            ),
+            execute_query(
+                table="participants",
+                operation="count",
+                filters={"pool_id": pool_id},
+                in_filters={"status": ("active", "pending")},
+            ),
         )
         return {
             "pool_id": pool_id,
@@ -775,39 +811,33 @@ async def trigger_github_verification(pool_id: int, wallet: str) -> dict:
     4. Flags them as complete so the agent doesn't check them again today
     """
     try:
-        # Get pool information
-        pools = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_id},
-            limit=1
+        # Pool and participant lookups are independent; overlap their
+        # round-trips and run the ordered checks afterwards
+        pool, participants = await asyncio.gather(
+            _get_pool_cached(pool_id),
+            execute_query(
+                table="participants",
+                operation="select",
+                filters={
+                    "pool_id": pool_id,
+                    "wallet_address": wallet
+                },
+                limit=1
+            ),
         )
-        
-        if not pools:
+
+        if pool is None:
             raise HTTPException(status_code=404, detail="Pool not found")
-        
-        pool = pools[0]
         goal_metadata = pool.get("goal_metadata") or {}
         habit_type = goal_metadata.get("habit_type")
-        
+
         # Verify this is a GitHub challenge
         if habit_type != "github_commits":
             raise HTTPException(
                 status_code=400,
                 detail="This endpoint is only for GitHub commit challenges"
             )
-        
-        # Get participant
-        participants = await execute_query(
-            table="participants",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "wallet_address": wallet
-            },
-            limit=1
-        )
-        
+
         if not participants:
             raise HTTPException(status_code=404, detail="Participant not found in pool")
         
@@ -868,15 +898,10 @@ async def trigger_github_verification(pool_id: int, wallet: str) -> dict:
             # Try agent first if available (has advanced features like code quality checking)
             if AGENT_AVAILABLE:
                 try:
-                    # Initialize minimal Monitor for verification
-                    solana_client = SolanaClient(
-                        rpc_url=settings.SOLANA_RPC_URL,
-                        program_id=settings.PROGRAM_ID,
-                    )
-                    await solana_client.initialize()
-                    verifier = Verifier(solana_client)
-                    monitor = Monitor(solana_client, verifier)
-                    
+                    # Shared Monitor: RPC connection setup is paid once, not
+                    # per verification request
+                    monitor = await get_monitor()
+
                     # Verify GitHub commits using agent (has advanced features)
                     passed, checked_commit_shas = await monitor.verify_github_commits(
                         pool, participant, current_day
@@ -903,25 +928,28 @@ async def trigger_github_verification(pool_id: int, wallet: str) -> dict:
                     "triggered_manually": True
                 }
                 
-                # Store or update verification
-                if existing_verifications:
-                    await execute_query(
-                        table="verifications",
-                        operation="update",
-                        filters={
-                            "pool_id": pool_id,
-                            "participant_wallet": wallet,
-                            "day": current_day
+                # One round-trip: the SQL function upserts the verification,
+                # recomputes days_verified and updates the participant row in
+                # a single transaction
+                try:
+                    await execute_rpc(
+                        "record_passed_verification",
+                        {
+                            "p_pool_id": pool_id,
+                            "p_wallet": wallet,
+                            "p_day": current_day,
+                            "p_verification_type": "github_commits",
+                            "p_proof": proof_data,
                         },
-                        data={
-                            "passed": True,
-                            "proof_data": proof_data
-                        }
                     )
-                else:
+                except Exception as e:
+                    # Function not deployed yet (see backend/sql/) - fall back
+                    # to the sequential writes
+                    logger.warning(f"record_passed_verification RPC unavailable, falling back: {e}")
+
                     await execute_query(
                         table="verifications",
-                        operation="insert",
+                        operation="upsert",
                         data={
                             "pool_id": pool_id,
                             "participant_wallet": wallet,
@@ -929,31 +957,30 @@ async def trigger_github_verification(pool_id: int, wallet: str) -> dict:
                             "passed": True,
                             "verification_type": "github_commits",
                             "proof_data": proof_data
+                        },
+                        on_conflict="pool_id,participant_wallet,day",
+                    )
+
+                    days_verified = await execute_query(
+                        table="verifications",
+                        operation="count",
+                        filters={
+                            "pool_id": pool_id,
+                            "participant_wallet": wallet,
+                            "passed": True
                         }
                     )
-                
-                # Update days_verified count
-                all_verifications = await execute_query(
-                    table="verifications",
-                    operation="select",
-                    filters={
-                        "pool_id": pool_id,
-                        "participant_wallet": wallet,
-                        "passed": True
-                    }
-                )
-                days_verified = len(all_verifications)
-                
-                await execute_query(
-                    table="participants",
-                    operation="update",
-                    filters={
-                        "pool_id": pool_id,
-                        "wallet_address": wallet
-                    },
-                    data={"days_verified": days_verified}
-                )
-                
+
+                    await execute_query(
+                        table="participants",
+                        operation="update",
+                        filters={
+                            "pool_id": pool_id,
+                            "wallet_address": wallet
+                        },
+                        data={"days_verified": days_verified}
+                    )
+
                 logger.info(
                     f"Immediate GitHub verification successful: pool={pool_id}, "
                     f"wallet={wallet}, day={current_day}"
@@ -1020,18 +1047,12 @@ async def verify_screen_time(
     5. Creates verification record if valid
     """
     try:
-        # Get pool information
-        pools = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_id},
-            limit=1
-        )
-        
-        if not pools:
+        # Get pool information (short-TTL cached)
+        pool = await _get_pool_cached(pool_id)
+
+        if pool is None:
             raise HTTPException(status_code=404, detail="Pool not found")
-        
-        pool = pools[0]
+
         goal_metadata = pool.get("goal_metadata") or {}
         habit_type = goal_metadata.get("habit_type")
         max_hours = goal_metadata.get("max_hours")
@@ -1111,9 +1132,33 @@ async def verify_screen_time(
                 "day": current_day
             }
         
-        # Read image file
+        # Read image file with a hard size cap. Screenshots are small; the
+        # cap keeps a single oversized upload from ballooning process memory
+        # (the vision API needs the bytes base64-encoded in one request body,
+        # so the read is chunked but still bounded rather than spooled to disk)
+        if file.size is not None and file.size > _MAX_SCREENSHOT_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Screenshot too large (max {_MAX_SCREENSHOT_BYTES // (1024 * 1024)}MB)"
+            )
+
         try:
-            image_data = await file.read()
+            chunks = []
+            total_bytes = 0
+            while True:
+                chunk = await file.read(1024 * 1024)
+                if not chunk:
+                    break
+                total_bytes += len(chunk)
+                if total_bytes > _MAX_SCREENSHOT_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Screenshot too large (max {_MAX_SCREENSHOT_BYTES // (1024 * 1024)}MB)"
+                    )
+                chunks.append(chunk)
+            image_data = b"".join(chunks)
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error reading image file: {e}")
             raise HTTPException(
@@ -1211,18 +1256,18 @@ async def verify_screen_time(
             )
         
         if passed:
-            # Update participant days_verified
-            all_verifications = await execute_query(
+            # Update participant days_verified (head/count query, no rows
+            # transferred)
+            days_verified = await execute_query(
                 table="verifications",
-                operation="select",
+                operation="count",
                 filters={
                     "pool_id": pool_id,
                     "participant_wallet": wallet,
                     "passed": True
                 }
             )
-            days_verified = len(all_verifications)
-            
+
             await execute_query(
                 table="participants",
                 operation="update",
@@ -1292,34 +1337,21 @@ async def delete_all_pools() -> dict:
     - All pool events
     """
     try:
-        # Get all pools first to return count
-        all_pools = await execute_query(
+        # One set-oriented DELETE ... RETURNING * (cascade handles related
+        # records); the returned rows double as the count, so no pre-select
+        deleted = await execute_query(
             table="pools",
-            operation="select",
+            operation="delete_all",
+            match_all_column="pool_id",
         )
-        pool_count = len(all_pools)
-        
-        # Delete all pools (cascade will handle related records)
-        # We need to delete each pool individually since Supabase doesn't support DELETE without filters
-        deleted_count = 0
-        for pool in all_pools:
-            pool_id = pool.get("pool_id")
-            if pool_id:
-                try:
-                    await execute_query(
-                        table="pools",
-                        operation="delete",
-                        filters={"pool_id": pool_id},
-                    )
-                    deleted_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to delete pool {pool_id}: {e}")
-        
-        logger.warning(f"Deleted {deleted_count} pools (requested {pool_count})")
+        deleted_count = len(deleted)
+
+        _invalidate_pool_cache()
+        logger.warning(f"Deleted {deleted_count} pools")
         return {
             "message": f"Deleted {deleted_count} pools",
             "deleted_count": deleted_count,
-            "requested_count": pool_count
+            "requested_count": deleted_count
         }
     
     except Exception as e:
@@ -1345,42 +1377,28 @@ async def delete_active_pools() -> dict:
     - All pool events
     """
     try:
-        # Get all active pools first
-        active_pools = await execute_query(
+        # One filtered DELETE ... RETURNING * (cascade handles related
+        # records); no pre-select needed for the count
+        deleted = await execute_query(
             table="pools",
-            operation="select",
+            operation="delete",
             filters={"status": "active"},
         )
-        pool_count = len(active_pools)
-        
-        if pool_count == 0:
+        deleted_count = len(deleted)
+
+        if deleted_count == 0:
             return {
                 "message": "No active pools found",
                 "deleted_count": 0,
                 "requested_count": 0
             }
-        
-        # Delete each active pool (cascade will handle related records)
-        deleted_count = 0
-        for pool in active_pools:
-            pool_id = pool.get("pool_id")
-            if pool_id:
-                try:
-                    await execute_query(
-                        table="pools",
-                        operation="delete",
-                        filters={"pool_id": pool_id},
-                    )
-                    deleted_count += 1
-                    logger.info(f"Deleted active pool {pool_id}: {pool.get('name', 'Unknown')}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete pool {pool_id}: {e}")
-        
-        logger.warning(f"Deleted {deleted_count} active pools (requested {pool_count})")
+
+        _invalidate_pool_cache()
+        logger.warning(f"Deleted {deleted_count} active pools")
         return {
             "message": f"Deleted {deleted_count} active pools",
             "deleted_count": deleted_count,
-            "requested_count": pool_count
+            "requested_count": deleted_count
         }
     
     except Exception as e:
@@ -1400,12 +1418,16 @@ async def confirm_pool_join(
 ) -> PoolResponse:
     """Confirm pool join after on-chain transaction."""
     try:
-        # Get existing pool
-        results = await execute_query(
-            table="pools",
-            operation="select",
-            filters={"pool_id": pool_id},
-            limit=1
+        # Fetch the pool and ensure the user row exists concurrently; the two
+        # are independent and _ensure_user tolerates failures internally
+        results, _ = await asyncio.gather(
+            execute_query(
+                table="pools",
+                operation="select",
+                filters={"pool_id": pool_id},
+                limit=1
+            ),
+            _ensure_user(join_data.participant_wallet),
         )
         
         if not results:
@@ -1423,7 +1445,7 @@ async def confirm_pool_join(
         
         if actual_start_time and current_time >= actual_start_time:
             # Pool has started - check if we're still in Day 1 (24 hour grace period)
-            day1_end = actual_start_time + 86400  # 24 hours after start
+            day1_end = actual_start_time + _DAY  # 24 hours after start
             if current_time >= day1_end:
                 raise HTTPException(
                     status_code=400,
@@ -1436,7 +1458,7 @@ async def confirm_pool_join(
             pass
         elif not scheduled_start and pool.get("status") == "active":
             # Pool is active and has no scheduled start (immediate start) - check if Day 1 has passed
-            day1_end = start_timestamp + 86400
+            day1_end = start_timestamp + _DAY
             if current_time >= day1_end:
                 raise HTTPException(
                     status_code=400,
@@ -1458,8 +1480,6 @@ async def confirm_pool_join(
                     owner = Pubkey.from_string(participant_wallet)
                     mint = Pubkey.from_string(token_mint)
 
-                    from solana.rpc.types import TokenAccountOpts
-
                     resp = await solana_client.get_token_accounts_by_owner(
                         owner,
                         TokenAccountOpts(mint=mint),
@@ -1522,151 +1542,119 @@ async def confirm_pool_join(
                         detail="Failed to verify token balance for HODL challenge join. Please try again.",
                     )
 
-        try:
-            users = await execute_query(
-                table="users",
-                operation="select",
-                filters={"wallet_address": participant_wallet},
-                limit=1
-            )
-            
-            if not users:
-                # Auto-create user
-                user_data = {
-                    "wallet_address": participant_wallet,
-                    "username": None,
-                    "twitter_handle": None,
-                    "reputation_score": 100,
-                    "total_games": 0,
-                    "games_completed": 0,
-                    "total_earned": 0.0,
-                    "streak_count": 0
-                }
-                await execute_query(
-                    table="users",
-                    operation="insert",
-                    data=user_data
-                )
-                logger.info(f"Auto-created user {participant_wallet}")
-        except Exception as e:
-            if "unique" not in str(e).lower() and "duplicate" not in str(e).lower():
-                logger.warning(f"Error checking/creating user: {e}")
-        
-        # Check if participant already exists
-        existing_participants = await execute_query(
-            table="participants",
-            operation="select",
-            filters={
-                "pool_id": pool_id,
-                "wallet_address": participant_wallet,
-            },
-            limit=1,
-        )
-        
-        if existing_participants:
-            logger.warning(f"Participant {participant_wallet} already exists for pool {pool_id}")
-            # Still update pool count if needed, but don't create duplicate participant
+        # Derive participant PDA (memoized; repeats are dict lookups)
+        if _PROGRAM_ID is None:
+            # Use placeholder if solders not available or PROGRAM_ID not configured
+            participant_pubkey_str = f"PLACEHOLDER_{pool_id}_{participant_wallet[:8]}"
+            logger.info(f"Using placeholder participant_pubkey: {participant_pubkey_str}")
         else:
-            # Derive participant PDA
-            if not SOLDERS_AVAILABLE or not settings.PROGRAM_ID:
-                # Use placeholder if solders not available or PROGRAM_ID not configured
-                participant_pubkey_str = f"PLACEHOLDER_{pool_id}_{participant_wallet[:8]}"
-                logger.info(f"Using placeholder participant_pubkey: {participant_pubkey_str}")
-            else:
-                try:
-                    program_id = Pubkey.from_string(settings.PROGRAM_ID)
-                    # Derive pool PDA: seeds = [b"pool", pool_id.to_le_bytes()]
-                    pool_id_bytes = pool_id.to_bytes(8, "little")
-                    pool_seeds = [b"pool", pool_id_bytes]
-                    pool_pubkey, _ = Pubkey.find_program_address(pool_seeds, program_id)
-                    
-                    # Derive participant PDA: seeds = [b"participant", pool.key(), participant.key()]
-                    participant_wallet_pubkey = Pubkey.from_string(participant_wallet)
-                    participant_seeds = [b"participant", bytes(pool_pubkey), bytes(participant_wallet_pubkey)]
-                    participant_pubkey, _ = Pubkey.find_program_address(participant_seeds, program_id)
-                    participant_pubkey_str = str(participant_pubkey)
-                    logger.info(f"Derived participant_pubkey: {participant_pubkey_str}")
-                except Exception as e:
-                    logger.warning(f"Failed to derive participant PDA: {e}, using placeholder")
-                    participant_pubkey_str = f"PLACEHOLDER_{pool_id}_{participant_wallet[:8]}"
-            
-            # Create participant record
-            stake_amount = pool.get("stake_amount", 0.0)
-            join_timestamp = int(time.time())
-            
-            participant_data = {
-                "pool_id": pool_id,
-                "wallet_address": participant_wallet,
-                "participant_pubkey": participant_pubkey_str,
-                "stake_amount": float(stake_amount),
-                "join_timestamp": join_timestamp,
-                "status": "active",
-                "days_verified": 0,
-            }
-            
             try:
-                await execute_query(
-                    table="participants",
-                    operation="insert",
-                    data=participant_data,
-                )
-                logger.info(f"Created participant record for {participant_wallet} in pool {pool_id}")
+                participant_pubkey_str = _derive_participant_pubkey(pool_id, participant_wallet)
+                logger.info(f"Derived participant_pubkey: {participant_pubkey_str}")
             except Exception as e:
-                # Check if it's a duplicate key error (race condition)
-                if "unique" in str(e).lower() or "duplicate" in str(e).lower():
-                    logger.warning(f"Participant record already exists (race condition): {e}")
-                else:
-                    logger.error(f"Failed to create participant record: {e}", exc_info=True)
-                    # Continue anyway - pool update will still happen
-        
-        # Update participant count and total staked
-        current_participants = pool.get("participant_count", 0)
-        new_participant_count = current_participants + 1
+                logger.warning(f"Failed to derive participant PDA: {e}, using placeholder")
+                participant_pubkey_str = f"PLACEHOLDER_{pool_id}_{participant_wallet[:8]}"
+
+        # Create participant record; current_time (epoch seconds) was already
+        # taken at the top of the request, so reuse it as the join timestamp
         stake_amount = pool.get("stake_amount", 0.0)
-        current_total_staked = pool.get("total_staked", 0.0)
-        
-        # Increment participant count and total staked
-        update_data = {
-            "participant_count": new_participant_count,
-            "total_staked": current_total_staked + stake_amount,
+        join_timestamp = current_time
+
+        participant_data = {
+            "pool_id": pool_id,
+            "wallet_address": participant_wallet,
+            "participant_pubkey": participant_pubkey_str,
+            "stake_amount": float(stake_amount),
+            "join_timestamp": join_timestamp,
+            "status": "active",
+            "days_verified": 0,
         }
-        
+
+        # Single round-trip INSERT ... ON CONFLICT (pool_id, wallet_address)
+        # DO NOTHING RETURNING *: atomic under concurrent joins with no race
+        # window between check and insert. An empty result means this wallet
+        # already joined, in which case the pool counters must not move again.
+        inserted = await execute_query(
+            table="participants",
+            operation="upsert",
+            data=participant_data,
+            on_conflict="pool_id,wallet_address",
+            ignore_duplicates=True,
+        )
+
+        if not inserted:
+            logger.warning(
+                f"Participant {participant_wallet} already joined pool {pool_id}; leaving pool counters unchanged"
+            )
+            return PoolResponse.model_validate(pool)
+
+        logger.info(f"Created participant record for {participant_wallet} in pool {pool_id}")
+
+        # Bump participant count and total staked atomically in the database;
+        # a Python read-modify-write loses counts under concurrent joins. The
+        # function returns the updated row, so the filled check below runs
+        # against the real post-increment count instead of a stale read.
+        try:
+            results = await execute_rpc(
+                "increment_pool_participation",
+                {"p_pool_id": pool_id, "p_stake": float(stake_amount)},
+            )
+        except Exception as e:
+            # Function not deployed yet (see backend/sql/) - fall back to the
+            # old read-modify-write rather than failing the join
+            logger.warning(f"increment_pool_participation RPC unavailable, falling back: {e}")
+            results = await execute_query(
+                table="pools",
+                operation="update",
+                filters={"pool_id": pool_id},
+                data={
+                    "participant_count": pool.get("participant_count", 0) + 1,
+                    "total_staked": pool.get("total_staked", 0.0) + stake_amount,
+                },
+            )
+
+        if not results:
+            raise HTTPException(status_code=500, detail="Failed to update pool")
+
+        updated_pool = results[0]
+        new_participant_count = updated_pool.get("participant_count", 0)
+
         # NEW RECRUITMENT SYSTEM: Check if minimum participants reached
-        min_participants = pool.get("min_participants", 1)
-        filled_at = pool.get("filled_at")
-        
-        if new_participant_count >= min_participants and filled_at is None:
+        min_participants = updated_pool.get("min_participants", 1)
+
+        if new_participant_count >= min_participants and updated_pool.get("filled_at") is None:
             # Challenge just filled! Set filled_at and auto_start_time (24h later)
             current_time = get_eastern_timestamp()
-            auto_start_time = current_time + 86400  # 24 hours from now
-            
-            update_data["filled_at"] = current_time
-            update_data["auto_start_time"] = auto_start_time
-            
+            auto_start_time = current_time + _DAY  # 24 hours from now
+
             # Update start_timestamp and end_timestamp based on auto_start_time
-            duration_days = pool.get("duration_days", 7)
-            update_data["start_timestamp"] = auto_start_time
-            update_data["end_timestamp"] = auto_start_time + (duration_days * 86400)
-            
+            duration_days = updated_pool.get("duration_days", 7)
+            fill_data = {
+                "filled_at": current_time,
+                "auto_start_time": auto_start_time,
+                "start_timestamp": auto_start_time,
+                "end_timestamp": auto_start_time + (duration_days * _DAY),
+            }
+
             logger.info(
                 f"Pool {pool_id} filled! Minimum participants ({min_participants}) reached. "
                 f"Challenge will start at {auto_start_time} (24h from now)"
             )
-        
+
+            fill_results = await execute_query(
+                table="pools",
+                operation="update",
+                filters={"pool_id": pool_id},
+                data=fill_data,
+            )
+            if fill_results:
+                updated_pool = fill_results[0]
+
         # Pool stays in "pending" status during recruitment - agent will activate it
-        
-        results = await execute_query(
-            table="pools",
-            operation="update",
-            filters={"pool_id": pool_id},
-            data=update_data
-        )
-        
-        if not results:
-            raise HTTPException(status_code=500, detail="Failed to update pool")
-        
+
+        _invalidate_pool_cache(pool_id)
         logger.info(f"Confirmed join for pool {pool_id} by {participant_wallet} with signature {join_data.transaction_signature}")
-        return PoolResponse(**results[0])
+        return PoolResponse.model_validate(updated_pool)
     
     except HTTPException:
         raise
@@ -1760,7 +1748,7 @@ async def forfeit_pool(
         if not updated_pools:
             raise HTTPException(status_code=500, detail="Failed to retrieve updated pool")
         
-        return PoolResponse(**updated_pools[0])
+        return PoolResponse.model_validate(updated_pools[0])
     
     except HTTPException:
         raise
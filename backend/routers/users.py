@@ -253,15 +253,14 @@ async def github_oauth_callback(
         
         # Verification successful - update user record
         try:
-            # Ensure user exists
-            users = await execute_query(
+            # Ensure user exists (HEAD/count probe; the row itself isn't needed)
+            user_exists = await execute_query(
                 table="users",
-                operation="select",
+                operation="exists",
                 filters={"wallet_address": wallet_address},
-                limit=1
             )
             
-            if not users:
+            if not user_exists:
                 # Auto-create user
                 user_data = {
                     "wallet_address": wallet_address,
@@ -427,15 +426,14 @@ async def verify_github(request: GitHubVerifyRequest) -> GitHubVerifyResponse:
         
         # Verification successful - update user record
         try:
-            # Ensure user exists
-            users = await execute_query(
+            # Ensure user exists (HEAD/count probe; the row itself isn't needed)
+            user_exists = await execute_query(
                 table="users",
-                operation="select",
+                operation="exists",
                 filters={"wallet_address": wallet_address},
-                limit=1
             )
             
-            if not users:
+            if not user_exists:
                 # Auto-create user
                 user_data = {
                     "wallet_address": wallet_address,
@@ -53,7 +53,7 @@ async def signup_waitlist(data: WaitlistSignup):
     Duplicate emails are updated with the latest info.
     """
     try:
-        client = get_supabase_client()
+        client = await get_supabase_client()
         
         signup_data = {
             "name": data.name,
@@ -64,7 +64,7 @@ async def signup_waitlist(data: WaitlistSignup):
         }
         
         # Upsert: if email already exists, update the record
-        response = client.table("waitlist_signups").upsert(
+        response = await client.table("waitlist_signups").upsert(
             signup_data,
             on_conflict="email"
         ).execute()
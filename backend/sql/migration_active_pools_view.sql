@@ -0,0 +1,16 @@
+-- ================================================================
+-- MIGRATION: active_pools view
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- Index-backed view over the pools still open for listing/joining.
+-- Querying this via PostgREST (table="active_pools") pushes the
+-- status IN ('pending', 'active') predicate into the database instead
+-- of filtering rows client-side; idx_pools_status covers the scan.
+CREATE OR REPLACE VIEW active_pools AS
+    SELECT *
+    FROM pools
+    WHERE status IN ('pending', 'active');
+
+COMMENT ON VIEW active_pools IS
+    'Pools in pending or active status; use for listings that should exclude ended/settled pools.';
@@ -0,0 +1,25 @@
+-- ================================================================
+-- MIGRATION: increment_pool_participation function
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- Atomic counter bump for the join-confirmation path. Incrementing
+-- participant_count / total_staked in the database serializes concurrent
+-- joins; the previous read-modify-write from Python silently lost counts
+-- when two wallets joined at once.
+--
+-- Returns the updated row so the caller can run the "minimum
+-- participants reached" check against the real post-increment count.
+CREATE OR REPLACE FUNCTION increment_pool_participation(
+    p_pool_id BIGINT,
+    p_stake NUMERIC
+)
+RETURNS SETOF pools
+LANGUAGE sql
+AS $$
+    UPDATE pools
+    SET participant_count = participant_count + 1,
+        total_staked = total_staked + p_stake
+    WHERE pool_id = p_pool_id
+    RETURNING *;
+$$;
@@ -0,0 +1,25 @@
+-- ================================================================
+-- MIGRATION: indexes for the pushed-down list_pools filters
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- participants(wallet_address) and pool_invites(invitee_wallet) are
+-- already indexed by schema.sql; these two cover what's missing now that
+-- list_pools runs its filtering in the database.
+
+-- Invitee-first composite: the invite lookup projects only pool_id, so
+-- this makes it an index-only scan. UNIQUE also backs the
+-- ON CONFLICT (pool_id, invitee_wallet) invite upsert from either
+-- column order.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_pool_invites_invitee_pool
+    ON pool_invites(invitee_wallet, pool_id);
+
+-- Partial index matching the common listing shape: status filter plus
+-- the is_public visibility clause, restricted to the statuses listings
+-- actually show. Ended/settled pools stay out of the index entirely.
+--
+-- CONCURRENTLY cannot run inside a transaction block; execute each
+-- statement on its own.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pools_status_public
+    ON pools(status, is_public)
+    WHERE status IN ('pending', 'active');
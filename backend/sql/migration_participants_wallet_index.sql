@@ -0,0 +1,18 @@
+-- ================================================================
+-- MIGRATION: participants(wallet_address, pool_id) index
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- list_pools looks up participants by wallet_address alone; without this
+-- index that query seq-scans the table as it grows. The composite form
+-- also serves WHERE wallet_address = $1 AND pool_id = $2 as an
+-- index-only scan.
+--
+-- The reverse ordering (pool_id, wallet_address) is already covered by
+-- the UNIQUE(pool_id, wallet_address) constraint in schema.sql, which
+-- backs the ON CONFLICT upsert in the join path.
+--
+-- CONCURRENTLY avoids locking writes while the index builds; it cannot
+-- run inside a transaction block, so execute this statement on its own.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_participants_wallet_pool
+    ON participants(wallet_address, pool_id);
@@ -0,0 +1,43 @@
+-- ================================================================
+-- MIGRATION: record_passed_verification function
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- Records a passed verification and rolls up the participant's
+-- days_verified in one transaction. The API previously issued
+-- insert-or-update verification -> count -> update participant as three
+-- serial round-trips; this does all of it database-side and returns the
+-- new days_verified. Backed by UNIQUE(pool_id, participant_wallet, day)
+-- on verifications.
+CREATE OR REPLACE FUNCTION record_passed_verification(
+    p_pool_id BIGINT,
+    p_wallet TEXT,
+    p_day INTEGER,
+    p_verification_type VARCHAR,
+    p_proof JSONB
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_days_verified INTEGER;
+BEGIN
+    INSERT INTO verifications (pool_id, participant_wallet, day, passed, verification_type, proof_data)
+    VALUES (p_pool_id, p_wallet, p_day, TRUE, p_verification_type, p_proof)
+    ON CONFLICT (pool_id, participant_wallet, day)
+    DO UPDATE SET passed = TRUE, proof_data = EXCLUDED.proof_data;
+
+    SELECT COUNT(*) INTO v_days_verified
+    FROM verifications
+    WHERE pool_id = p_pool_id
+      AND participant_wallet = p_wallet
+      AND passed;
+
+    UPDATE participants
+    SET days_verified = v_days_verified
+    WHERE pool_id = p_pool_id
+      AND wallet_address = p_wallet;
+
+    RETURN v_days_verified;
+END;
+$$;
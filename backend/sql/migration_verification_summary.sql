@@ -0,0 +1,38 @@
+-- ================================================================
+-- MIGRATION: get_participant_verification_summary function
+-- Run in Supabase SQL Editor after schema.sql
+-- ================================================================
+
+-- Aggregates a participant's verifications in one scan instead of
+-- shipping every row to the API just to count them. Returns a JSON
+-- object with total/passed counts plus the per-day rows the
+-- verifications endpoint exposes (proof_data is deliberately omitted -
+-- it can be large and the endpoint never returns it).
+CREATE OR REPLACE FUNCTION get_participant_verification_summary(
+    p_pool_id BIGINT,
+    p_wallet TEXT
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total', COUNT(*),
+        'passed', COUNT(*) FILTER (WHERE passed),
+        'rows', COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'day', day,
+                    'passed', passed,
+                    'verification_type', verification_type,
+                    'verified_at', verified_at
+                )
+                ORDER BY day
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM verifications
+    WHERE pool_id = p_pool_id
+      AND participant_wallet = p_wallet;
+$$;
@@ -4,6 +4,7 @@ Timezone utilities for the Commitment Parties app.
 All date/time operations should use Eastern Standard Time (EST/EDT) as the app's timezone.
 """
 
+import functools
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
 from typing import Optional
@@ -117,14 +118,18 @@ def calculate_current_day(start_timestamp: int, current_timestamp: Optional[int]
     return current_day
 
 
+@functools.lru_cache(maxsize=4096)
 def get_challenge_day_window(start_timestamp: int, day: int) -> tuple[datetime, datetime]:
     """
     Get the start and end datetime for a specific challenge day in Eastern Time.
-    
+
+    Pure function of its integer inputs, and every check-in for the same pool
+    and day recomputes the same window, so results are memoized.
+
     Args:
         start_timestamp: Unix timestamp when pool started
         day: Challenge day number (1-indexed)
-    
+
     Returns:
         Tuple of (day_start, day_end) in Eastern timezone
     """